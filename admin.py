@@ -3,10 +3,10 @@
 """Blueprint for the admin interface
 """
 
+from collections.abc import Callable, Sequence
 from typing import NamedTuple
 from enum import StrEnum
-from glob import glob
-import os.path
+import os
 import re
 
 from ckautils import typecast
@@ -18,8 +18,8 @@ from werkzeug.security import generate_password_hash
 from core import DATA_DIR, UPLOAD_DIR, log, ImplementationError
 from security import current_user, DUMMY_PW_STR
 from database import DB_FILETYPE, db_init, db_name, db_reset, db_is_initialized
-from schema import (clear_schema_cache, Bracket, TournStage, TOURN_INIT, ALL_STAGES,
-                    ACTIVE_STAGES, TournInfo)
+from schema import (clear_schema_cache, Bracket, TournStage, TOURN_INIT, TOURN_FINAL,
+                    ALL_STAGES, ACTIVE_STAGES, TournInfo)
 from euchmgr import (tourn_create, upload_roster, generate_player_nums, build_seed_bracket,
                      fake_seed_games, validate_seed_round, compute_player_ranks,
                      prepick_champ_partners, fake_pick_partners, build_tourn_teams,
@@ -43,20 +43,51 @@ TOURN_TEMPLATE = "tourn.html"
 # tourn stuff #
 ###############
 
+_DB_SUFFIX_LEN = len(DB_FILETYPE)
+
+# tuple: (DATA_DIR mtime, list of tournament names, tournament selector list)
+_tourns_cache: tuple[int, list[str], list[str]] | None = None
+
+def _invalidate_tourns_cache() -> None:
+    """Force the next `get_tourns` call to rescan DATA_DIR (belt-and-braces, since the
+    directory mtime already reflects creation/removal of database files).
+    """
+    global _tourns_cache
+    _tourns_cache = None
+
+def _load_tourns_cache() -> tuple[int, list[str], list[str]] | None:
+    """Return the tournament list cache, which is (re-)loaded if the mtime for DATA_DIR
+    has changed.  Returns `None` if DATA_DIR does not exist.
+    """
+    global _tourns_cache
+    try:
+        mtime = os.stat(DATA_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _tourns_cache and _tourns_cache[0] == mtime:
+        return _tourns_cache
+
+    with os.scandir(DATA_DIR) as it:
+        tourns = sorted(entry.name[:-_DB_SUFFIX_LEN] for entry in it
+                        if entry.is_file(follow_symlinks=False)
+                        and entry.name.endswith(DB_FILETYPE))
+    _tourns_cache = (mtime, tourns, tourns + [SEL_SEP, SEL_NEW])
+    return _tourns_cache
+
 def get_tourns() -> list[str]:
     """Get list of existing tournaments (currently based on existence of database file in
-    DATA_DIR--later, we can do something more structured)
+    DATA_DIR--later, we can do something more structured).  The list is cached, and only
+    rebuilt when the mtime for DATA_DIR changes.
     """
-    glob_str  = os.path.join(DATA_DIR, r'*' + DB_FILETYPE)
-    match_str = os.path.join(DATA_DIR, r'(.+)' + DB_FILETYPE)
-
-    tourns = []
-    for file in glob(glob_str):
-        m = re.fullmatch(match_str, file)
-        assert m and len(m.groups()) == 1
-        tourns.append(m.groups()[0])
+    cache = _load_tourns_cache()
+    return cache[1] if cache else []
 
-    return sorted(tourns)
+def get_tourn_select() -> list[str]:
+    """Same as `get_tourns`, but with the separator and "create new" entries appended (for
+    the tournament selector).
+    """
+    cache = _load_tourns_cache()
+    return cache[2] if cache else [SEL_SEP, SEL_NEW]
 
 ##############
 # view stuff #
@@ -82,6 +113,9 @@ def view_path(view: str) -> str:
     """
     return '/' + view
 
+# precomputed absolute paths (for redirects)
+VIEW_PATHS = {view: view_path(view) for view in View}
+
 class ViewInfo(NamedTuple):
     """This is not super-pretty, but we want to make this as data-driven as possible
     """
@@ -144,11 +178,56 @@ VIEW_DEFS = {
     )
 }
 
-def view_menu() -> list[tuple[str, str]]:
-    """Return list of tuples representing navigation menu items of the following form:
-    (view, label), where "view" string value doubles as its relative path name.
+# string-keyed version (for lookups by route parameter)
+VIEW_DEFS_BY_NAME = {str(view): info for view, info in VIEW_DEFS.items()}
+
+# conditional view info (by completed stage), overriding `VIEW_DEFS`; list entries are
+# tuples of (minimum stage_compl, view_info), sorted by descending stage
+VIEW_INFO_OVERRIDES = {
+    View.PLAYERS: [
+        (TournStage.SEED_RANKS, ViewInfo(
+            "Players",
+            pl_layout,
+            "nick_name",
+            [11],  # player_rank
+            3
+        ))
+    ],
+    View.TEAMS: [
+        (TournStage.SEMIS_RANKS, ViewInfo(
+            "Teams",
+            tm_layout,
+            "team_name",
+            [14],  # final_rank
+            2
+        )),
+        (TournStage.TOURN_RANKS, ViewInfo(
+            "Teams",
+            tm_layout,
+            "team_name",
+            [13, 12],  # div_rank, tourn_rank
+            2
+        ))
+    ],
+    View.FINAL_FOUR: [
+        (TournStage.TOURN_RANKS, ViewInfo(
+            "Final Four",
+            ff_layout,
+            "team_name",
+            [12, 1],  # playoff_rank, tourn_rank
+            2
+        ))
+    ]
+}
+
+# list of tuples representing navigation menu items of the following form: (view, label),
+# where "view" string value doubles as its relative path name
+VIEW_MENU = tuple((str(view), info.name) for view, info in VIEW_DEFS.items())
+
+def view_menu() -> tuple[tuple[str, str], ...]:
+    """Return navigation menu items (see `VIEW_MENU`, which is computed once on load).
     """
-    return [(str(view), info.name) for view, info in VIEW_DEFS.items()]
+    return VIEW_MENU
 
 STAGE_MAPPING = [
     (TournStage.FINALS_RANKS,   View.FINAL_FOUR),
@@ -163,15 +242,24 @@ STAGE_MAPPING = [
     (TournStage.PLAYER_NUMS,    View.PLAYERS),
 ]
 
+def stage_view(stage_start: int) -> View:
+    """Return the view for the specified starting stage, based on `STAGE_MAPPING` (first
+    entry not later than the stage).  This is only used to build `STAGE_VIEW` (below).
+    """
+    for stage, view in STAGE_MAPPING:
+        if stage_start >= stage:
+            return view
+    return None
+
+# precomputed lookup for all stage values (including virtual stages)
+STAGE_VIEW = {stage: stage_view(stage) for stage in range(TOURN_INIT, TOURN_FINAL + 1)}
+
 def active_view(tourn: TournInfo) -> View:
     """Return active view for the current stage of the tournament.
     """
     if tourn.stage_start is None:
         return None
-    for stage, view in STAGE_MAPPING:
-        if tourn.stage_start >= stage:
-            return view
-    return None
+    return STAGE_VIEW.get(tourn.stage_start)
 
 ##############
 # GET routes #
@@ -225,14 +313,11 @@ def tourn() -> str:
     }
     return render_tourn(context)
 
-@admin.get("/players")
-@admin.get("/seeding")
-@admin.get("/partners")
-@admin.get("/teams")
-@admin.get("/round_robin")
-@admin.get("/final_four")
-@admin.get("/playoffs")
-def view() -> str:
+# route converter matching the views rendered through ADMIN_TEMPLATE
+VIEW_CONV = f"any({','.join(VIEW_DEFS)})"
+
+@admin.get(f"/<{VIEW_CONV}:view>")
+def view(view: str) -> str:
     """Render the requested view directly.
     """
     if not current_user.is_authenticated:
@@ -241,7 +326,6 @@ def view() -> str:
     if g.mobile:
         return render_error(403, desc="Mobile access unauthorized")
 
-    view = request.path.split('/')[-1]
     tourn = TournInfo.get()
 
     params, msgs = process_flashes()
@@ -298,6 +382,16 @@ VIEW_ACTIONS = {
     ]
 }
 
+# string-keyed version (for lookups by route parameter)
+VIEW_ACTIONS_BY_NAME = {str(view): tuple(actions) for view, actions in VIEW_ACTIONS.items()}
+
+# route converter for action targets (note that this includes View.TOURN)
+ACTION_VIEW_CONV = f"any({','.join(VIEW_ACTIONS)})"
+
+# flattened (string-keyed) version of `VIEW_ACTIONS` for request validation
+VALID_VIEW_ACTIONS = frozenset((str(view), action) for view, actions in VIEW_ACTIONS.items()
+                               for action in actions)
+
 # key: action function (doubles as button name in views)
 # value: tuple(action/button display name, list of stages when valid/callable)
 ACTION_INFO = {
@@ -320,30 +414,24 @@ ACTION_INFO = {
     'tabulate_finals_results': ("Tabulate Finals Results",     [TournStage.FINALS_RESULTS])
 }
 
-@admin.post("/tourn/<action>")
-@admin.post("/players/<action>")
-@admin.post("/seeding/<action>")
-@admin.post("/partners/<action>")
-@admin.post("/teams/<action>")
-@admin.post("/round_robin/<action>")
-@admin.post("/final_four/<action>")
-@admin.post("/playoffs/<action>")
-def view_action(action: str) -> str:
+# convert stage lists to sets (for membership checks on every render and action)
+ACTION_INFO = {action: (label, frozenset(stages))
+               for action, (label, stages) in ACTION_INFO.items()}
+
+@admin.post(f"/<{ACTION_VIEW_CONV}:view>/<action>")
+def view_action(view: str, action: str) -> str:
     """Process submitted form, switch on ``action``, which is validated against paths and
     values in ``VIEW_ACTIONS``
     """
     if not current_user.is_authenticated:
         abort(401, "Not authenticated")
 
-    view = request.path.split('/')[-2]
-    if view not in VIEW_ACTIONS:
-        abort(404, f"Invalid action target '{view}'")
     if 'action' not in request.form:
         abort(400, "Invalid request, no action specified")
     form_action = request.form['action']
     if form_action != action:
         abort(400, f"Invalid request, mismatched action '{form_action}'")
-    if action not in VIEW_ACTIONS[view]:
+    if (view, action) not in VALID_VIEW_ACTIONS:
         abort(400, f"Invalid action '{action}' for target '{view}'")
 
     assert action in ACTION_INFO
@@ -355,12 +443,28 @@ def view_action(action: str) -> str:
             abort(400, f"Invalid action '{action}' for stage '{tourn.cur_stage}'")
     elif TOURN_INIT not in valid_stages:
         abort(400, f"No active tournament for action '{action}'")
-    return globals()[action](request.form)
+    return ACTION_DISPATCH[action](request.form)
 
 ##################
 # /tourn actions #
 ##################
 
+def teardown_tourn() -> str:
+    """Disconnect server from the database for the current tournament, clearing all
+    associated cache and session state; returns the tournament name.  Note that the
+    "paused" message is flashed here, for both explicit and implicit (i.e. switching
+    tournaments) pausing.
+    """
+    assert db_is_initialized()
+    tourn_name = db_name()
+    db_reset(force=True)
+    clear_schema_cache()
+    _invalidate_tourns_cache()
+    popped = session.pop('tourn', None)
+    assert popped == tourn_name
+    flash(f"info=Tournament \"{tourn_name}\" has been paused")
+    return tourn_name
+
 def select_tourn(form: dict) -> str:
     """Render default view for existing tournament, or new tournament creation view.  Note
     that this is called against the `select_tourn` form.
@@ -368,14 +472,12 @@ def select_tourn(form: dict) -> str:
     tourn_name = form.get('tourn')
     if tourn_name == SEL_NEW:
         if db_is_initialized():
-            assert session['tourn'] == db_name()
-            pause_tourn({'tourn_name': db_name()})
+            teardown_tourn()
         flash("create_new=True")
         return redirect(url_for('admin.tourn'))
 
     if db_is_initialized() and db_name() != tourn_name:
-        assert session['tourn'] == db_name()
-        pause_tourn({'tourn_name': db_name()})
+        teardown_tourn()
     if not db_is_initialized():
         assert not session.get('tourn')
         db_init(tourn_name, force=True)
@@ -384,6 +486,8 @@ def select_tourn(form: dict) -> str:
         flash(f"info=Resuming operation of tournament \"{tourn_name}\"")
     return redirect(url_for('index'))
 
+TABLE_EXISTS_RE = re.compile(r'table "\w+" already exists')
+
 def create_tourn(form: dict) -> str:
     """Create new tournament from form data.  Note that this is called against the
     `tourn_info` form.
@@ -402,13 +506,12 @@ def create_tourn(form: dict) -> str:
         roster_file = secure_filename(req_file.filename)
         roster_path = os.path.join(UPLOAD_DIR, roster_file)
         req_file.save(roster_path)
-        if dflt_pw:
-            dflt_pw_hash = generate_password_hash(dflt_pw)
-        else:
-            dflt_pw_hash = None
         try:
             assert not session.get('tourn')
             db_init(tourn_name, force=True)
+            # note that password hashing is expensive, so we defer it until we know that
+            # the database is usable
+            dflt_pw_hash = generate_password_hash(dflt_pw) if dflt_pw else None
             attrs = {
                 'dates'       : dates,
                 'venue'       : venue,
@@ -416,12 +519,12 @@ def create_tourn(form: dict) -> str:
             }
             tourn = tourn_create(force=overwrite, **attrs)
             upload_roster(roster_path)
-            tourn = TournInfo.get()
+            _invalidate_tourns_cache()
             session['tourn'] = tourn.name
             log.info(f"setting tourn = '{tourn.name}' in session state")
             return render_view(View.PLAYERS)  # TODO: let `index` do the routing for us!!!
         except OperationalError as e:
-            if re.fullmatch(r'table "\w+" already exists', str(e)):
+            if TABLE_EXISTS_RE.fullmatch(str(e)):
                 db_reset(force=True)
                 err_msg = (f'Tournament "{tourn_name}" already exists; either check the '
                            '"Overwrite Existing" box or specify a new name')
@@ -461,6 +564,8 @@ def update_tourn(form: dict) -> str:
         pw_upd = dflt_pw != DUMMY_PW_STR
     else:
         pw_upd = bool(dflt_pw)
+    # only hash if the password was actually changed (otherwise `None` either means no
+    # update, or explicitly clearing the existing value)
     if pw_upd and dflt_pw:
         dflt_pw_hash = generate_password_hash(dflt_pw)
     else:
@@ -495,13 +600,8 @@ def pause_tourn(form: dict) -> str:
     tourn_name = form.get('tourn_name')
     tourn = TournInfo.get()
     assert tourn.name == tourn_name
-    assert db_is_initialized()
-    assert db_name() == tourn_name
-    db_reset(force=True)
-    clear_schema_cache()
-    popped = session.pop('tourn', None)
-    assert popped == tourn_name
-    flash(f"info=Tournament \"{tourn_name}\" has been paused")
+    paused = teardown_tourn()
+    assert paused == tourn_name
     return redirect(url_for('index'))
 
 ####################
@@ -616,6 +716,11 @@ def tabulate_finals_results(form: dict) -> str:
     compute_playoff_ranks(Bracket.FINALS, finalize=True)
     return render_view(View.FINAL_FOUR)
 
+# dispatch table for `view_action` (must follow all action function definitions)
+ACTION_DISPATCH: dict[str, Callable[[dict], str]] = {
+    action: globals()[action] for actions in VIEW_ACTIONS.values() for action in actions
+}
+
 #############
 # renderers #
 #############
@@ -646,120 +751,101 @@ LINK_INFO = {
     ]
 }
 
+# string-keyed version (for lookups by route parameter)
+LINK_INFO_BY_NAME = {str(view): tuple(links) for view, links in LINK_INFO.items()}
+
+# constant portions of the rendering context (dynamic entries are added per request)
+TOURN_BASE_CTX = {
+    'title'    : APP_NAME,
+    'sel_sep'  : SEL_SEP,
+    'sel_new'  : SEL_NEW,
+    'dummy_pw' : DUMMY_PW_STR,
+    'tourn'    : None,   # context may contain override
+    'new_tourn': False,  # ditto
+    'err_msg'  : None,   # ditto
+    'info_msg' : None    # ditto
+}
+
+ADMIN_BASE_CTX = {
+    'title'    : APP_NAME,
+    'view_menu': VIEW_MENU,
+    'tourn'    : None,  # context may contain override
+    'err_msg'  : None,  # ditto
+    'info_msg' : None   # ditto
+}
+
+class Button(NamedTuple):
+    """Action button rendering info
+    """
+    value: str  # action name
+    label: str  # display name
+    attr:  str  # enabled/disabled attribute string
+
+def button_info(buttons: Sequence[str], stage_compl: int) -> list[Button]:
+    """Return rendering info for the specified list of action buttons (enabled/disabled
+    based on the completed stage).
+    """
+    return [Button(btn, label, '' if stage_compl in stages else BTN_DISABLED)
+            for btn, (label, stages) in zip(buttons, map(ACTION_INFO.get, buttons))]
+
 def render_tourn(context: dict) -> str:
     """Common post-processing of context before rendering the tournament selector and
     creation page through Jinja
     """
     buttons = VIEW_ACTIONS[View.TOURN]
-    btn_info = [ACTION_INFO[btn] for btn in buttons]
 
     stage_compl = TOURN_INIT
     if context.get('tourn'):
         stage_compl = context['tourn'].stage_compl or TOURN_INIT
-    btn_lbl = []
-    btn_attr = []
-    for label, stages in btn_info:
-        btn_lbl.append(label)
-        btn_attr.append('' if stage_compl in stages else BTN_DISABLED)
-
-    base_ctx = {
-        'title'    : APP_NAME,
+    btns = button_info(buttons, stage_compl)
+
+    ctx = {
+        **TOURN_BASE_CTX,
         'user'     : current_user,
-        'tourn_sel': get_tourns() + [SEL_SEP, SEL_NEW],
-        'sel_sep'  : SEL_SEP,
-        'sel_new'  : SEL_NEW,
-        'dummy_pw' : DUMMY_PW_STR,
-        'tourn'    : None,   # context may contain override
-        'new_tourn': False,  # ditto
-        'buttons'  : buttons,
-        'btn_lbl'  : btn_lbl,
-        'btn_attr' : btn_attr,
-        'help_txt' : help_txt,
-        'err_msg'  : None,   # context may contain override
-        'info_msg' : None    # ditto
+        'tourn_sel': get_tourn_select(),
+        'btns'     : btns,
+        'help_txt' : help_txt
     }
-    return render_response(TOURN_TEMPLATE, **(base_ctx | context))
+    ctx.update(context)
+    return render_response(TOURN_TEMPLATE, **ctx)
 
 def render_view(view: View) -> str:
     """Render the specified view using redirect (to be called from POST action handlers).
     Note that we are not passing any context information as query string params, so all
     information must be conveyed through the session object.
     """
-    return redirect(view_path(view))
+    return redirect(VIEW_PATHS[view])
 
 def render_admin(context: dict) -> str:
     """Common post-processing of context before rendering the main app page through Jinja
     """
     view = context.get('view')
-    assert view in VIEW_DEFS
-    assert view in VIEW_ACTIONS
-    buttons = VIEW_ACTIONS[view]
-    btn_info = [ACTION_INFO[btn] for btn in buttons]
+    assert view in VIEW_DEFS_BY_NAME
+    assert view in VIEW_ACTIONS_BY_NAME
+    buttons = VIEW_ACTIONS_BY_NAME[view]
 
     stage_compl = TOURN_INIT
     if context.get('tourn'):
         stage_compl = context['tourn'].stage_compl or TOURN_INIT
-    btn_lbl = []
-    btn_attr = []
-    for label, stages in btn_info:
-        btn_lbl.append(label)
-        btn_attr.append('' if stage_compl in stages else BTN_DISABLED)
-
-    view_info = VIEW_DEFS[view]
-    # TEMP: for now, do this manual hack for testing--really need to put a little
-    # structure around conditional view_info (will still be hacky, though)!!!
-    if view == View.PLAYERS:
-        if stage_compl >= TournStage.SEED_RANKS:
-            view_info = ViewInfo(
-                "Players",
-                pl_layout,
-                "nick_name",
-                [11],  # player_rank
-                3
-            )
-    elif view == View.TEAMS:
-        if stage_compl >= TournStage.SEMIS_RANKS:
-            view_info = ViewInfo(
-                "Teams",
-                tm_layout,
-                "team_name",
-                [14],  # final_rank
-                2
-            )
-        elif stage_compl >= TournStage.TOURN_RANKS:
-            view_info = ViewInfo(
-                "Teams",
-                tm_layout,
-                "team_name",
-                [13, 12],  # div_rank, tourn_rank
-                2
-            )
-    elif view == View.FINAL_FOUR:
-        if stage_compl >= TournStage.TOURN_RANKS:
-            view_info = ViewInfo(
-                "Final Four",
-                ff_layout,
-                "team_name",
-                [12, 1],  # playoff_rank, tourn_rank
-                2
-            )
-
-    base_ctx = {
-        'title'    : APP_NAME,
+    btns = button_info(buttons, stage_compl)
+
+    view_info = VIEW_DEFS_BY_NAME[view]
+    for min_stage, override in VIEW_INFO_OVERRIDES.get(view, ()):
+        if stage_compl >= min_stage:
+            view_info = override
+            break
+
+    ctx = {
+        **ADMIN_BASE_CTX,
         'user'     : current_user,
-        'tourn'    : None,  # context may contain override
         'view'     : view,  # also represents relative path name
         'view_info': view_info,
-        'view_menu': view_menu(),
-        'buttons'  : buttons,
-        'btn_lbl'  : btn_lbl,
-        'btn_attr' : btn_attr,
-        'links'    : LINK_INFO.get(view),
-        'help_txt' : help_txt,
-        'err_msg'  : None,  # context may contain override
-        'info_msg' : None   # ditto
+        'btns'     : btns,
+        'links'    : LINK_INFO_BY_NAME.get(view),
+        'help_txt' : help_txt
     }
-    return render_response(ADMIN_TEMPLATE, **(base_ctx | context))
+    ctx.update(context)
+    return render_response(ADMIN_TEMPLATE, **ctx)
 
 #########################
 # content / metacontent #
@@ -3,7 +3,13 @@
 """Blueprint for chart rendering
 """
 
-from flask import Blueprint, session, render_template, abort
+from collections.abc import Iterator, Callable
+from itertools import groupby
+from operator import attrgetter
+
+from flask import Blueprint, session, stream_template, abort
+from flask.blueprints import BlueprintSetupState
+from markupsafe import Markup
 
 from schema import GAME_PTS
 from ui_schema import (Numeric, fmt_pct, fmt_tally, TournInfo, Player, SeedGame, Team,
@@ -14,18 +20,21 @@ from euchmgr import get_div_maps
 # utility stuff #
 #################
 
-def fmt_score(pts: int) -> str:
+def fmt_score(pts: int) -> Markup:
     """Version for scoring charts--markup score if game-winning (bold)
     """
     # special case for byes (no markup)
     if pts == -1:
-        return '&ndash;'
+        return Markup('&ndash;')
 
     ret = str(pts)
     if pts >= GAME_PTS:
         ret = f"<b>{ret}</b>"
 
-    return ret
+    return Markup(ret)
+
+# preformatted scores (including byes), so game tabulation only needs table lookups
+SCORE_STR = {pts: fmt_score(pts) for pts in range(-1, GAME_PTS + 1)}
 
 def fmt_stat(val: Numeric) -> str:
     """Version for scoring charts--handle empty values properly.  Note that float vals are
@@ -34,15 +43,67 @@ def fmt_stat(val: Numeric) -> str:
     if val is None:
         return ''
     elif isinstance(val, float):
-        return f"{fmt_pct(val)}"
+        return fmt_pct(val)
     else:
         assert isinstance(val, int)
         return str(val)
 
+def tabulate_games(games: list[tuple], id_attr: str, ids: list[int]
+                   ) -> tuple[dict[tuple[int, int], str], dict[tuple[int, int], str],
+                              dict[int, int], dict[int, int]]:
+    """Tabulate formatted team and opponent points by (id, rnd), as well as wins and
+    losses by id, for the specified player or team game records (`id_attr` identifies the
+    attribute to use as key).  Byes are marked up through the current round (i.e. latest
+    round with a completed game).
+    """
+    team_pts = {}
+    opp_pts  = {}
+    wins     = dict.fromkeys(ids, 0)
+    losses   = dict.fromkeys(ids, 0)
+
+    # fetch all needed attributes in one call per game
+    game_attrs = attrgetter(id_attr, 'round_num', 'team_pts', 'opp_pts', 'is_bye',
+                            'is_winner')
+    cur_rnd = 0
+    byes    = []
+    for game in games:
+        ent_id, rnd, pts, opp, bye, winner = game_attrs(game)
+        if bye:
+            byes.append((ent_id, rnd))
+            continue
+        assert (ent_id, rnd) not in team_pts, (ent_id, rnd)  # same keys as opp_pts
+        team_pts[ent_id, rnd] = SCORE_STR[pts]
+        opp_pts[ent_id, rnd] = SCORE_STR[opp]
+        if winner:
+            wins[ent_id] += 1
+        else:
+            losses[ent_id] += 1
+        if rnd > cur_rnd:
+            cur_rnd = rnd
+
+    # byes are deferred until the current round is known
+    for ent_id, rnd in byes:
+        assert (ent_id, rnd) not in team_pts, (ent_id, rnd)
+        if rnd <= cur_rnd:
+            team_pts[ent_id, rnd] = SCORE_STR[-1]
+            opp_pts[ent_id, rnd] = SCORE_STR[-1]
+
+    return team_pts, opp_pts, wins, losses
+
 # quick and dirty stuff (yucky!)
 SPC = lambda x: '&nbsp;' * x
 PTS = lambda x: f"{SPC(1)}{x}{SPC(2)}" if x == GAME_PTS else f"{SPC(2)}{x}{SPC(2)}"
 
+# precomputed padded score strings (valid scores are 0 through GAME_PTS)
+PTS_STR = {pts: PTS(pts) for pts in range(GAME_PTS + 1)}
+
+# matchup cell templates (for completed and open games, respectively); note that filled-in
+# cells are wrapped as `Markup` so they are not escaped when rendered
+MATCHUP_DONE = (f"{{tag1}}{SPC(3)}<u class='u2'>{{pts1}}</u><br>vs.<br>"
+                f"{{tag2}}{SPC(3)}<u class='u2'>{{pts2}}</u>")
+MATCHUP_OPEN = (f"{{tag1}}{SPC(3)}<u class='u2'>{SPC(5)}</u><br>vs.<br>"
+                f"{{tag2}}{SPC(3)}<u class='u2'>{SPC(5)}</u>")
+
 ###################
 # blueprint stuff #
 ###################
@@ -50,11 +111,21 @@ PTS = lambda x: f"{SPC(1)}{x}{SPC(2)}" if x == GAME_PTS else f"{SPC(2)}{x}{SPC(2
 chart = Blueprint('chart', __name__)
 CHART_TEMPLATE = "chart.html"
 
+@chart.record_once
+def precompile_template(state: BlueprintSetupState) -> None:
+    """Compile the chart template when the blueprint is registered (rather than on first
+    request).
+    """
+    state.app.jinja_env.get_template(CHART_TEMPLATE)
+
 SD_BRACKET  = "Seeding Round Bracket"
 SD_SCORES   = "Seeding Round Scores"
 RR_BRACKETS = "Round Robin Brackets"
 RR_SCORES   = "Round Robin Scores"
 
+# max age (in seconds) of cached tournament info for chart requests
+CHART_TOURN_MAX_AGE = 5.0
+
 CHART_FUNCS = [
     'sd_bracket',
     'sd_scores',
@@ -63,61 +134,61 @@ CHART_FUNCS = [
 ]
 
 @chart.get("/<chart>")
-def get_chart(chart: str) -> str:
+def get_chart(chart: str) -> Iterator[str]:
     """Render specified chart
     """
-    if chart not in CHART_FUNCS:
+    chart_func = CHART_DISPATCH.get(chart)
+    if not chart_func:
         abort(404, f"Invalid chart '{chart}'")
 
-    tourn = TournInfo.get(requery=True)
-    return globals()[chart](tourn)
+    tourn = TournInfo.get(requery=True, max_age=CHART_TOURN_MAX_AGE)
+    return chart_func(tourn)
 
-def render_chart(context: dict) -> str:
-    """Common post-processing of context before rendering chart pages through Jinja
+def render_chart(context: dict) -> Iterator[str]:
+    """Common post-processing of context before rendering chart pages through Jinja.  The
+    output is streamed within the request context (`stream_template` wraps the generator
+    in `stream_with_context`), so database access during template iteration still works,
+    but note that the connection is held (teardown is deferred) until the stream finishes.
     """
-    return render_template(CHART_TEMPLATE, **context)
+    return stream_template(CHART_TEMPLATE, **context)
 
 ##############
 # sd_bracket #
 ##############
 
-def sd_bracket(tourn: TournInfo) -> str:
+def sd_bracket(tourn: TournInfo) -> Iterator[str]:
     """Render seed round bracket as a chart
     """
     rnd_tables = tourn.players // 4
     rnd_byes = tourn.players % 4
 
-    matchups = {}  # key sequence: rnd, tbl -> matchup_html
-    labels   = {}
-    complete = {}
+    # indexed by [rnd][tbl] -> matchup_html (rnd and tbl are 1-based; byes go in slot 0
+    # for each round, and slot 0 for rnd is not used)
+    matchups = [[None] * (rnd_tables + 1) for _ in range(tourn.seed_rounds + 1)]
+    labels   = [[None] * (rnd_tables + 1) for _ in range(tourn.seed_rounds + 1)]
+    complete = [[False] * (rnd_tables + 1) for _ in range(tourn.seed_rounds + 1)]
     sg_iter = SeedGame.iter_games(include_byes=True)
     for sg in sg_iter:
         rnd = sg.round_num
-        tbl = sg.table_num
-        if rnd not in matchups:
-            matchups[rnd] = {}
-            labels[rnd]   = {}
-            complete[rnd] = {}
-        assert tbl not in matchups[rnd]
-        assert tbl not in labels[rnd]
-        assert tbl not in complete[rnd]
+        tbl = sg.table_num or 0
+        assert matchups[rnd][tbl] is None, (rnd, tbl)  # also covers labels, complete
         labels[rnd][tbl] = sg.label
-        complete[rnd][tbl] = False
         if tbl:
+            tag1, tag2 = sg.team_tags
             if sg.winner:
-                tm1_str = f"{sg.team_tags[0]}{SPC(3)}<u class='u2'>{PTS(sg.team1_pts)}</u>"
-                tm2_str = f"{sg.team_tags[1]}{SPC(3)}<u class='u2'>{PTS(sg.team2_pts)}</u>"
+                matchups[rnd][tbl] = Markup(MATCHUP_DONE.format(
+                    tag1=tag1, pts1=PTS_STR[sg.team1_pts],
+                    tag2=tag2, pts2=PTS_STR[sg.team2_pts]))
                 complete[rnd][tbl] = True
             else:
-                tm1_str = f"{sg.team_tags[0]}{SPC(3)}<u class='u2'>{SPC(5)}</u>"
-                tm2_str = f"{sg.team_tags[1]}{SPC(3)}<u class='u2'>{SPC(5)}</u>"
-            matchups[rnd][tbl] = f"{tm1_str}<br>vs.<br>{tm2_str}"
+                matchups[rnd][tbl] = Markup(MATCHUP_OPEN.format(tag1=tag1, tag2=tag2))
         else:
-            matchups[rnd][tbl] = "<br>".join(sg.bye_tags)  # one or more byes
+            matchups[rnd][tbl] = Markup("<br>".join(sg.bye_tags))  # one or more byes
 
-    assert len(matchups) == tourn.seed_rounds
-    for rnd, tbls in matchups.items():
-        assert len(tbls) == rnd_tables + int(bool(rnd_byes))
+    if __debug__:
+        first_tbl = 0 if rnd_byes else 1
+        for tbls in matchups[1:]:
+            assert all(tbls[first_tbl:])
 
     context = {
         'chart_num' : 0,
@@ -137,35 +208,14 @@ def sd_bracket(tourn: TournInfo) -> str:
 # sd_scores #
 #############
 
-def sd_scores(tourn: TournInfo) -> str:
+def sd_scores(tourn: TournInfo) -> Iterator[str]:
     """Render seed round scores as a chart
     """
-    pl_list = sorted(Player.iter_players(), key=lambda pl: pl.player_num)
-    # sub-dict key is rnd, value is pts
-    team_pts = {pl.player_num: {} for pl in pl_list}
-    opp_pts  = {pl.player_num: {} for pl in pl_list}
-    wins     = {pl.player_num: 0 for pl in pl_list}
-    losses   = {pl.player_num: 0 for pl in pl_list}
-
-    pg_list = list(PlayerGame.iter_games(include_byes=True))
-    not_bye = lambda g: not g.is_bye
-    max_rnd = lambda ls: max(g.round_num for g in ls) if ls else 0
-    cur_rnd = max_rnd(list(filter(not_bye, pg_list)))
-    for pg in pg_list:
-        pl_num = pg.player_num
-        rnd = pg.round_num
-        assert rnd not in team_pts[pl_num]
-        assert rnd not in opp_pts[pl_num]
-        if not pg.is_bye:
-            team_pts[pl_num][rnd] = fmt_score(pg.team_pts)
-            opp_pts[pl_num][rnd] = fmt_score(pg.opp_pts)
-            if pg.is_winner:
-                wins[pl_num] += 1
-            else:
-                losses[pl_num] += 1
-        elif rnd <= cur_rnd:
-            team_pts[pl_num][rnd] = fmt_score(-1)
-            opp_pts[pl_num][rnd] = fmt_score(-1)
+    pl_list = list(Player.iter_players(order_by='player_num'))
+    pl_nums = [pl.player_num for pl in pl_list]
+    pg_list = list(PlayerGame.iter_game_rows(include_byes=True))
+    # points keyed by (player_num, rnd); wins and losses keyed by player_num
+    team_pts, opp_pts, wins, losses = tabulate_games(pg_list, 'player_num', pl_nums)
 
     win_tallies = {}
     loss_tallies = {}
@@ -194,7 +244,7 @@ def sd_scores(tourn: TournInfo) -> str:
 # rr_bracket #
 ##############
 
-def rr_brackets(tourn: TournInfo) -> str:
+def rr_brackets(tourn: TournInfo) -> Iterator[str]:
     """Render round robin brackets as a chart
     """
     div_list   = list(range(1, tourn.divisions + 1))
@@ -207,40 +257,39 @@ def rr_brackets(tourn: TournInfo) -> str:
         div_tables[div] = nteams // 2
         div_byes[div] = nteams % 2
 
-    # key sequence for sub-dict: rnd, tbl -> matchup_html
-    matchups = {div: {} for div in div_list}
-    labels   = {div: {} for div in div_list}
-    complete = {div: {} for div in div_list}
+    # indexed by div -> [rnd][tbl] -> matchup_html (rnd and tbl are 1-based; byes go in
+    # slot 0 for each round, and slot 0 for rnd is not used)
+    nrnds    = tourn.tourn_rounds + 1
+    matchups = {div: [[None] * (div_tables[div] + 1) for _ in range(nrnds)]
+                for div in div_list}
+    labels   = {div: [[None] * (div_tables[div] + 1) for _ in range(nrnds)]
+                for div in div_list}
+    complete = {div: [[False] * (div_tables[div] + 1) for _ in range(nrnds)]
+                for div in div_list}
     tg_iter = TournGame.iter_games(include_byes=True)
     for tg in tg_iter:
         div = tg.div_num
         rnd = tg.round_num
-        tbl = tg.table_num
-        if rnd not in matchups[div]:
-            matchups[div][rnd] = {}
-            labels[div][rnd]   = {}
-            complete[div][rnd] = {}
-        assert tbl not in matchups[div][rnd]
-        assert tbl not in labels[div][rnd]
-        assert tbl not in complete[div][rnd]
+        tbl = tg.table_num or 0
+        assert matchups[div][rnd][tbl] is None, (div, rnd, tbl)  # also covers labels, etc.
         labels[div][rnd][tbl] = tg.label
-        complete[div][rnd][tbl] = False
         if tbl:
+            tag1, tag2 = tg.team_tags
             if tg.winner:
-                tm1_str = f"{tg.team_tags[0]}{SPC(3)}<u class='u2'>{PTS(tg.team1_pts)}</u>"
-                tm2_str = f"{tg.team_tags[1]}{SPC(3)}<u class='u2'>{PTS(tg.team2_pts)}</u>"
+                matchups[div][rnd][tbl] = Markup(MATCHUP_DONE.format(
+                    tag1=tag1, pts1=PTS_STR[tg.team1_pts],
+                    tag2=tag2, pts2=PTS_STR[tg.team2_pts]))
                 complete[div][rnd][tbl] = True
             else:
-                tm1_str = f"{tg.team_tags[0]}{SPC(3)}<u class='u2'>{SPC(5)}</u>"
-                tm2_str = f"{tg.team_tags[1]}{SPC(3)}<u class='u2'>{SPC(5)}</u>"
-            matchups[div][rnd][tbl] = f"{tm1_str}<br>vs.<br>{tm2_str}"
+                matchups[div][rnd][tbl] = Markup(MATCHUP_OPEN.format(tag1=tag1, tag2=tag2))
         else:
-            matchups[div][rnd][tbl] = tg.bye_tag
+            matchups[div][rnd][tbl] = Markup(tg.bye_tag)
 
-    for div in div_list:
-        assert len(matchups[div]) == tourn.tourn_rounds
-        for rnd, tbls in matchups[div].items():
-            assert len(tbls) == div_tables[div] + div_byes[div]
+    if __debug__:
+        for div in div_list:
+            first_tbl = 0 if div_byes[div] else 1
+            for tbls in matchups[div][1:]:
+                assert all(tbls[first_tbl:])
 
     context = {
         'chart_num' : 2,
@@ -261,50 +310,24 @@ def rr_brackets(tourn: TournInfo) -> str:
 # rr_scores #
 #############
 
-def rr_scores(tourn: TournInfo) -> str:
+def rr_scores(tourn: TournInfo) -> Iterator[str]:
     """Render round robin scores as a chart
     """
     div_list = list(range(1, tourn.divisions + 1))
-    tm_list  = sorted(Team.iter_teams(), key=lambda tm: tm.team_seed)
-    # inner dict represents points by round {rnd: pts}
-    team_pts = {tm.id: {} for tm in tm_list}
-    opp_pts  = {tm.id: {} for tm in tm_list}
-    wins     = {tm.id: 0 for tm in tm_list}
-    losses   = {tm.id: 0 for tm in tm_list}
-
-    tg_list = list(TeamGame.iter_games(include_byes=True))
-    not_bye = lambda g: not g.is_bye
-    max_rnd = lambda ls: max(g.round_num for g in ls) if ls else 0
-    cur_rnd = {div: max_rnd(list(filter(not_bye, tg_list))) for div in div_list}
-    for tg in tg_list:
-        div = tg.team.div_num
-        tm_id = tg.team_id
-        assert tm_id == tg.team.id
-        rnd = tg.round_num
-        assert rnd not in team_pts[tm_id]
-        assert rnd not in opp_pts[tm_id]
-        if not tg.is_bye:
-            team_pts[tm_id][rnd] = fmt_score(tg.team_pts)
-            opp_pts[tm_id][rnd] = fmt_score(tg.opp_pts)
-            if tg.is_winner:
-                wins[tm_id] += 1
-            else:
-                losses[tm_id] += 1
-        elif rnd <= cur_rnd[div]:
-            team_pts[tm_id][rnd] = fmt_score(-1)
-            opp_pts[tm_id][rnd] = fmt_score(-1)
-
+    tm_list  = list(Team.iter_teams(order_by=('div_num', 'team_seed')))
+    tm_ids   = [tm.id for tm in tm_list]
+    tg_list  = list(TeamGame.iter_game_rows(include_byes=True))
+    # points keyed by (team id, rnd); wins and losses keyed by team id.  Note that the
+    # current round (for bye markup) is determined across all divisions
+    team_pts, opp_pts, wins, losses = tabulate_games(tg_list, 'team_id', tm_ids)
+
+    # teams are ordered by division, then seed
     div_teams = {div: [] for div in div_list}
-    # the following are all keyed off of team id
-    win_tallies = {}
-    loss_tallies = {}
-    for tm in tm_list:
-        div = tm.div_num
-        tm_id = tm.id
-
-        div_teams[div].append(tm)
-        win_tallies[tm_id] = fmt_tally(wins[tm_id])
-        loss_tallies[tm_id] = fmt_tally(losses[tm_id])
+    by_div = groupby(tm_list, key=attrgetter('div_num'))
+    div_teams.update({div: list(teams) for div, teams in by_div})
+    # the following are keyed off of team id
+    win_tallies = {ent_id: fmt_tally(n) for ent_id, n in wins.items()}
+    loss_tallies = {ent_id: fmt_tally(n) for ent_id, n in losses.items()}
 
     context = {
         'chart_num'   : 3,
@@ -323,3 +346,8 @@ def rr_scores(tourn: TournInfo) -> str:
         'bold_color'  : '#555555'
     }
     return render_chart(context)
+
+# dispatch table for `get_chart` (must follow all chart function definitions)
+CHART_DISPATCH: dict[str, Callable[[TournInfo], Iterator[str]]] = {
+    chart: globals()[chart] for chart in CHART_FUNCS
+}
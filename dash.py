@@ -3,12 +3,22 @@
 """Blueprint for live dashboard rendering
 """
 
-from itertools import groupby
-
-from flask import Blueprint, session, render_template, abort
+import re
+import time
+from hashlib import blake2b
+from collections.abc import Callable
+from functools import lru_cache
+from operator import attrgetter
+
+from flask import (Blueprint, Response, current_app, render_template, make_response,
+                   abort)
+from flask.blueprints import BlueprintSetupState
+from jinja2 import Template
+from markupsafe import Markup
 
 from database import now_str
 from schema import GAME_PTS
+from ui_common import conditional_response
 from ui_schema import (Numeric, fmt_pct, fmt_tally, TournInfo, Player, PartnerPick, Team,
                        PlayerGame, TeamGame, PlayoffGame)
 
@@ -19,61 +29,71 @@ from ui_schema import (Numeric, fmt_pct, fmt_tally, TournInfo, Player, PartnerPi
 DashStat = Numeric | str
 UNDEF = '-- undef --'
 
-def fmt_dash_score(pts: int, prev_pts: int = -1) -> str:
-    """Version for live dashboards--markup score if changed from prev (em); do not
-    highlight game-winner scores (too distracting)
-    """
-    # special case for byes (no markup)
-    if pts == -1:
-        return '&ndash;'
-
-    ret = str(pts)
-    #if pts >= GAME_PTS:
-    #    ret = f"<i>{ret}</i>"
+# note that formatted values are returned as `Markup` (so they are not re-escaped when
+# rendered); BOLD_FMT escapes plain string args, and passes `Markup` args through
+DASH_NONE = Markup('&ndash;')
+BOLD_FMT  = Markup("<b>{}</b>").format
 
-    if prev_pts != -1 and pts != prev_pts:
-        assert pts >= (prev_pts or 0)
-        ret = f"<b>{ret}</b>"
+# preformatted scores (plain and highlighted), indexed by points
+DASH_PTS_STR  = tuple(Markup(pts) for pts in range(GAME_PTS + 1))
+DASH_PTS_BOLD = tuple(BOLD_FMT(pts) for pts in range(GAME_PTS + 1))
 
-    return ret
+# preformatted rank movement, indexed by rank diff (larger diffs formatted on the fly)
+MVMT_MAX = 32
+MVMT_STR = {diff: Markup(f"{diff:+d}") for diff in range(-MVMT_MAX, MVMT_MAX + 1) if diff}
 
-def fmt_dash_stat(val: DashStat, prev_val: DashStat = UNDEF, no_style: bool = False) -> str:
+def fmt_dash_scores(pts: list[int | None], prev_pts: list[int | None] = None) -> list[str]:
+    """Version for live dashboards, formatting a row of scores (indexed by round) at a
+    time--markup score if changed from prev (em); do not highlight game-winner scores (too
+    distracting).  Byes are represented as -1, and empty slots as None.
+    """
+    if prev_pts is None:
+        return ['' if p is None else DASH_NONE if p == -1 else DASH_PTS_STR[p] for p in pts]
+    return ['' if p is None else DASH_NONE if p == -1 else
+            DASH_PTS_BOLD[p] if prev != -1 and p != prev else DASH_PTS_STR[p]
+            for p, prev in zip(pts, prev_pts)]
+
+@lru_cache(maxsize=2048, typed=True)
+def fmt_dash_stat(val: DashStat, prev_val: DashStat = UNDEF,
+                  no_style: bool = False) -> Markup:
     """Version for live dashboards--markup stat if changed from prev (em), do rounding for
     float values.  Note that float vals are assumed to represent percentages (percent sign
-    to be style along with the val itself).
+    to be style along with the val itself).  Cached with `typed=True`, since int and float
+    values format differently (e.g. 1 vs. 1.0).
     """
     if val is None:
-        return ''
+        return Markup('')
 
-    if prev_val == UNDEF or no_style:
+    val_type = type(val)
+    if prev_val is UNDEF or no_style:
         # no previous reference is treated as no change, no styling
-        if isinstance(val, float):
-            return f"{fmt_pct(val)}"
-        elif isinstance(val, int):
-            return str(val)
-        assert isinstance(val, str)
-        return val
+        if val_type is float:
+            return fmt_pct(val)
+        elif val_type is int:
+            return Markup(val)
+        assert val_type is str
+        return Markup(val)
     elif prev_val is None:
         # previously empty represents changed value
-        if isinstance(val, float):
-            return f"<b>{fmt_pct(val)}</b>"
-        return f"<b>{val}</b>"
-
-    if isinstance(val, float):
-        assert isinstance(prev_val, float)
-        if fmt_pct(val) == fmt_pct(prev_val):
-            return f"{fmt_pct(val)}"
-        return f"<b>{fmt_pct(val)}</b>"
-    elif isinstance(val, int):
-        assert isinstance(prev_val, int)
+        if val_type is float:
+            return BOLD_FMT(fmt_pct(val))
+        return BOLD_FMT(val)
+
+    assert type(prev_val) is val_type
+    if val_type is float:
+        # identical raw values need no formatting comparison
+        val_str = fmt_pct(val)
+        if val == prev_val or val_str == fmt_pct(prev_val):
+            return val_str
+        return BOLD_FMT(val_str)
+    elif val_type is int:
         if val == prev_val:
-            return str(val)
-        return f"<b>{val}</b>"
-    assert isinstance(val, str)
-    assert isinstance(prev_val, str)
+            return Markup(val)
+        return BOLD_FMT(val)
+    assert val_type is str
     if val == prev_val:
-        return val
-    return f"<b>{val}</b>"
+        return Markup(val)
+    return BOLD_FMT(val)
 
 ###################
 # blueprint stuff #
@@ -83,6 +103,17 @@ dash = Blueprint('dash', __name__)
 DASH_TEMPLATE = "dash.html"
 BRACKET_TEMPLATE = "bracket.html"
 
+@dash.record_once
+def precompile_templates(state: BlueprintSetupState) -> None:
+    """Compile the live dashboard templates when the blueprint is registered (rather than
+    on first request).
+    """
+    state.app.jinja_env.get_template(DASH_TEMPLATE)
+    state.app.jinja_env.get_template(BRACKET_TEMPLATE)
+
+# compiled templates, resolved on first use (see `get_dash_template`)
+DASH_TEMPLATES: dict[str, Template] = {}
+
 SD_DASH = "Seeding Round Live Dashboard"
 RR_DASH = "Round Robin Live Dashboard"
 PT_DASH = "Partner Picks Live Dashboard"
@@ -108,183 +139,252 @@ FF_UPDATE_ADJ = 100
 COLCLS_UP   = 'grn_fg'
 COLCLS_DOWN = 'red_fg'
 
-# session storage key
+# prefix for update time in rendered pages (must match DASH_TEMPLATE and BRACKET_TEMPLATE)
+UPDATED_FMT = "Updated: {} ("
+UPDATED_RE  = re.compile(r"Updated: [^(]* \(")
+
+# previous frames for live dashboards, keyed by (tourn name, frame key); note that these
+# are kept in process memory (rather than the user session), and shared across clients
+DASH_FRAMES: dict[tuple[str, str], dict] = {}
+
+# most recently rendered page for each live dashboard, keyed by (tourn name, dash), and
+# shared across clients polling within the same update window; value: (time, html, etag)
+DASH_HTML: dict[tuple[str, str], tuple[float, str, str]] = {}
+# max age (in seconds) of shared rendered pages
+DASH_HTML_MAX_AGE = 2.0
+
+# frame storage key
 SD_DASH_KEY = 'sd_dash'
 RR_DASH_KEY = 'rr_dash'
 PT_DASH_KEY = 'pt_dash'
 FF_DASH_KEY = 'ff_dash'
 
+def dash_etag(html: str) -> str:
+    """Return entity tag for a rendered live dashboard page.  The update time is ignored,
+    so that polling clients get a "304 Not Modified" response if nothing else changed.
+    """
+    content = UPDATED_RE.sub('', html, count=1)
+    return blake2b(content.encode(), digest_size=16).hexdigest()
+
 @dash.get("/<dash>")
-def get_dash(dash: str) -> str:
+def get_dash(dash: str) -> Response:
     """Render specified live dashboard
     """
-    if dash not in DASH_FUNCS:
+    dash_func = DASH_DISPATCH.get(dash)
+    if not dash_func:
         abort(404, f"Invalid dash '{dash}'")
 
     tourn = TournInfo.get(requery=True)
-    return globals()[dash](tourn)
+    cached = DASH_HTML.get((tourn.name, dash))
+    if cached and time.monotonic() - cached[0] <= DASH_HTML_MAX_AGE:
+        _, html, etag = cached
+    else:
+        html = dash_func(tourn)
+        etag = dash_etag(html)
+        DASH_HTML[tourn.name, dash] = (time.monotonic(), html, etag)
+
+    return conditional_response(make_response(html), etag)
+
+def get_dash_template(name: str) -> Template | str:
+    """Return the compiled template for the specified name, so that rendering on every
+    dashboard poll skips the lookup and up-to-date check.  The name itself is returned if
+    templates are being auto-reloaded (e.g. in debug mode), for normal resolution.
+    """
+    env = current_app.jinja_env
+    if env.auto_reload:
+        return name
+    if not (template := DASH_TEMPLATES.get(name)):
+        template = DASH_TEMPLATES[name] = env.get_template(name)
+    return template
 
 def render_dash(context: dict) -> str:
     """Common post-processing of context before rendering live dashboard pages through
     Jinja
     """
-    return render_template(DASH_TEMPLATE, **context)
+    return render_template(get_dash_template(DASH_TEMPLATE), **context)
 
 def render_bracket(context: dict) -> str:
     """Common post-processing of context before rendering live dashboard pages through
     Jinja
     """
-    return render_template(BRACKET_TEMPLATE, **context)
+    return render_template(get_dash_template(BRACKET_TEMPLATE), **context)
 
-###########
-# sd_dash #
-###########
+##########################
+# sd_dash/rr_dash common #
+##########################
 
-def sd_dash(tourn: TournInfo) -> str:
-    """Render seed round live dashboard
+def fmt_dash_stats(stats: tuple[DashStat, ...],
+                   prev_stats: tuple[DashStat, ...] = None) -> tuple[Markup, ...]:
+    """Format stats tuple for live dashboards--only the last stat (rank) is styled if
+    changed from prev.
     """
-    update_int = DASH_UPDATE_INT - SD_UPDATE_ADJ
-    done = tourn.seeding_done()
-
-    sort_key = lambda pl: pl.player_rank_final or tourn.players
-    pl_list  = sorted(Player.iter_players(), key=sort_key)
-    # inner dict represents points by round {rnd: pts}
-    team_pts = {pl.player_num: {} for pl in pl_list}
-    opp_pts  = {pl.player_num: {} for pl in pl_list}
-    wins     = {pl.player_num: 0 for pl in pl_list}
-    losses   = {pl.player_num: 0 for pl in pl_list}
+    if prev_stats is None:
+        prev_stats = (UNDEF,) * len(stats)
+    last = len(stats) - 1
+    return tuple(fmt_dash_stat(val, prev_val, no_style=(i < last))
+                 for i, (val, prev_val) in enumerate(zip(stats, prev_stats)))
+
+def cached_score_dash(tourn: TournInfo, done: bool, dash_key: str,
+                      games: list[tuple]) -> str | None:
+    """Return the previously rendered page for the seeding round or round robin live
+    dashboard (with the update time refreshed) if nothing has changed since the previous
+    frame, otherwise None.  The page would otherwise render the same, since all formatted
+    values are reused from the previous frame in this case (see `render_score_dash`).
+    """
+    if done:
+        return None
+    prev_frame = DASH_FRAMES.get((tourn.name, dash_key))
+    if not prev_frame or tourn.created_at != prev_frame['created_at']:
+        return None
+    if sum(g.team_pts for g in games if not g.is_bye) != prev_frame['tot_pts']:
+        return None
+    return prev_frame['html'].replace(UPDATED_FMT.format(prev_frame['updated']),
+                                      UPDATED_FMT.format(now_str()), 1)
+
+def render_score_dash(tourn: TournInfo, done: bool, dash_key: str, rnds: int,
+                      entities: list[Player | Team], id_attr: str,
+                      games: list[tuple], game_id_attr: str,
+                      stat_attrs: tuple[str, ...], context: dict) -> str:
+    """Tabulate, format, and render scores and stats for the seeding round or round robin
+    live dashboard, highlighting changes from the previous frame (stored in `DASH_FRAMES`
+    under `dash_key`).  `entities` (players or teams, in display order) are keyed by
+    `id_attr`, and games by `game_id_attr`.  `stat_attrs` specifies the entity stats to
+    display, the last of which must be the rank (used to show movement).  Points (raw and
+    formatted) are stored as lists per entity, indexed by round (1-based, `rnds` total).
+    `context` contains the dashboard-specific entries for rendering.
+    """
+    ids      = [getattr(ent, id_attr) for ent in entities]
+    # note that the current round is determined across all divisions (for round robin)
+    cur_rnd  = 0
     tot_gms  = 0
     tot_pts  = 0
 
-    pg_list = list(PlayerGame.iter_games(include_byes=True))
-    not_bye = lambda g: not g.is_bye
-    max_rnd = lambda ls: max(g.round_num for g in ls) if ls else 0
-    cur_rnd = max_rnd(list(filter(not_bye, pg_list)))
-    for pg in pg_list:
-        pl_num = pg.player_num
-        assert pl_num == pg.player.player_num
-        rnd = pg.round_num
-        assert rnd not in team_pts[pl_num]
-        assert rnd not in opp_pts[pl_num]
-        if not pg.is_bye:
+    # group games by entity up front, so that each entity's points and wins/losses can be
+    # tabulated along with the formatting below
+    games_by_id = {ent_id: [] for ent_id in ids}
+    for game in games:
+        games_by_id[getattr(game, game_id_attr)].append(game)
+        if not game.is_bye:
             tot_gms += 1
-            tot_pts += pg.team_pts
-            team_pts[pl_num][rnd] = pg.team_pts
-            opp_pts[pl_num][rnd] = pg.opp_pts
-            if pg.is_winner:
-                wins[pl_num] += 1
-            else:
-                losses[pl_num] += 1
-        elif rnd <= cur_rnd:
-            team_pts[pl_num][rnd] = -1
-            opp_pts[pl_num][rnd] = -1
+            tot_pts += game.team_pts
+            cur_rnd = max(cur_rnd, game.round_num)
 
     prev_tot_gms     = 0
     prev_tot_pts     = 0
     prev_team_pts    = {}
     prev_opp_pts     = {}
-    prev_pts_for     = {}
-    prev_pts_against = {}
     prev_stats       = None
-    prev_stats_fmt   = None
     prev_mvmt        = None
     prev_colcls      = None
-    if prev_frame := session.get(SD_DASH_KEY):
-        if str(tourn.created_at) > prev_frame['updated']:
-            session.pop(SD_DASH_KEY)
+    if prev_frame := DASH_FRAMES.get((tourn.name, dash_key)):
+        if tourn.created_at != prev_frame['created_at']:
+            DASH_FRAMES.pop((tourn.name, dash_key), None)
         else:
             prev_tot_gms     = prev_frame['tot_gms']
             prev_tot_pts     = prev_frame['tot_pts']
             prev_team_pts    = prev_frame['team_pts']
             prev_opp_pts     = prev_frame['opp_pts']
-            prev_pts_for     = prev_frame['pts_for']
-            prev_pts_against = prev_frame['pts_against']
             prev_stats       = prev_frame['stats']
-            prev_stats_fmt   = prev_frame['stats_fmt']
             prev_mvmt        = prev_frame['mvmt']
             prev_colcls      = prev_frame['colcls']
 
-    # the following are all keyed off of player_num
+    updated = now_str()
+    get_stats = attrgetter(*stat_attrs)
+    rank_attr = stat_attrs[-1]
+    # the following are all keyed off of entity id; inner list represents points by
+    # round (None if no game, -1 for bye)
+    team_pts     = {}
+    opp_pts      = {}
+    wins         = {}
+    losses       = {}
     win_tallies  = {}
     loss_tallies = {}
-    stats        = {}  # value: (win_pct, pts_pct, rank)
-    stats_fmt    = {}  # value: (win_pct, pts_pct, rank)
+    stats        = {}  # value: tuple of stats (per `stat_attrs`)
+    stats_fmt    = {}  # value: tuple of formatted stats
     mvmt         = {}
     colcls       = {}
-    # inner dict represents points (formatted!) by round
-    pts_for      = {pl.player_num: {} for pl in pl_list}
-    pts_against  = {pl.player_num: {} for pl in pl_list}
-    for pl in pl_list:
-        pl_num = pl.player_num
+    # inner list represents points (formatted!) by round
+    pts_for      = {}
+    pts_against  = {}
+
+    # pts_for/_agnst and stats are always formatted here, since unchanged frames (if not
+    # done) are served by `cached_score_dash`; mvmt and colcls are conditionally reused
+    # (same condition for all entities, so we determine it once here)
+    reuse_mvmt = bool(prev_stats) and tot_pts == prev_tot_pts and bool(prev_mvmt)
+    for ent, ent_id in zip(entities, ids):
+        ent_pts = team_pts[ent_id] = [None] * (rnds + 1)
+        ent_opp = opp_pts[ent_id] = [None] * (rnds + 1)
+        ent_wins = 0
+        ent_losses = 0
+        for game in games_by_id[ent_id]:
+            rnd = game.round_num
+            assert ent_pts[rnd] is None
+            if not game.is_bye:
+                ent_pts[rnd] = game.team_pts
+                ent_opp[rnd] = game.opp_pts
+                if game.is_winner:
+                    ent_wins += 1
+                else:
+                    ent_losses += 1
+            elif rnd <= cur_rnd:
+                ent_pts[rnd] = -1
+                ent_opp[rnd] = -1
+        wins[ent_id] = ent_wins
+        losses[ent_id] = ent_losses
 
         # we always (re-)format win/loss tallies (for now)
-        win_tallies[pl_num] = fmt_tally(wins[pl_num])
-        loss_tallies[pl_num] = fmt_tally(losses[pl_num])
-
-        # conditionally, we either format or reuse string values for pts_for/_agnst,
-        # stats, mvmt, and colcls (always recompute if not done)
-        if prev_stats:
-            if tot_pts == prev_tot_pts and not done:
-                pts_for[pl_num] = prev_pts_for[pl_num]
-                pts_against[pl_num] = prev_pts_against[pl_num]
-                stats_fmt[pl_num] = prev_stats_fmt[pl_num]
-            else:
-                for rnd, cur_pts in team_pts[pl_num].items():
-                    prev_pts = prev_team_pts[pl_num].get(rnd)
-                    pts_for[pl_num][rnd] = fmt_dash_score(cur_pts, prev_pts)
-                for rnd, cur_pts in opp_pts[pl_num].items():
-                    prev_pts = prev_opp_pts[pl_num].get(rnd)
-                    pts_against[pl_num][rnd] = fmt_dash_score(cur_pts, prev_pts)
-
-                stats[pl_num] = (
-                    pl.seed_win_pct,
-                    pl.player_pos_str,
-                    pl.seed_pts_pct,
-                    pl.player_rank_final
-                )
-                stats_fmt[pl_num] = (
-                    fmt_dash_stat(stats[pl_num][0], prev_stats[pl_num][0], no_style=True),
-                    fmt_dash_stat(stats[pl_num][1], prev_stats[pl_num][1], no_style=True),
-                    fmt_dash_stat(stats[pl_num][2], prev_stats[pl_num][2], no_style=True),
-                    fmt_dash_stat(stats[pl_num][3], prev_stats[pl_num][3])
-                )
-
-            if tot_pts == prev_tot_pts and prev_mvmt:
-                mvmt[pl_num] = prev_mvmt.get(pl_num, '')
-                colcls[pl_num] = prev_colcls.get(pl_num, '')
-            elif prev_stats[pl_num][3]:
-                rank_diff = (prev_stats[pl_num][3] or 0) - (pl.player_rank_final or 0)
-                if rank_diff > 0:
-                    mvmt[pl_num] = f'+{rank_diff}'
-                    colcls[pl_num] = COLCLS_UP
-                elif rank_diff < 0:
-                    mvmt[pl_num] = str(rank_diff)
-                    colcls[pl_num] = COLCLS_DOWN
-            if pl_num not in mvmt:
-                mvmt[pl_num] = '&ndash;'
-                colcls[pl_num] = ''
-        else:
-            for rnd, cur_pts in team_pts[pl_num].items():
-                pts_for[pl_num][rnd] = fmt_dash_score(cur_pts)
-            for rnd, cur_pts in opp_pts[pl_num].items():
-                pts_against[pl_num][rnd] = fmt_dash_score(cur_pts)
-
-            stats[pl_num] = (
-                pl.seed_win_pct,
-                pl.player_pos_str,
-                pl.seed_pts_pct,
-                pl.player_rank_final
-            )
-            stats_fmt[pl_num] = (
-                fmt_dash_stat(stats[pl_num][0], no_style=True),
-                fmt_dash_stat(stats[pl_num][1], no_style=True),
-                fmt_dash_stat(stats[pl_num][2], no_style=True),
-                fmt_dash_stat(stats[pl_num][3])
-            )
+        win_tallies[ent_id] = fmt_tally(ent_wins)
+        loss_tallies[ent_id] = fmt_tally(ent_losses)
+
+        if not prev_stats:
+            pts_for[ent_id] = fmt_dash_scores(ent_pts)
+            pts_against[ent_id] = fmt_dash_scores(ent_opp)
+
+            stats[ent_id] = get_stats(ent)
+            stats_fmt[ent_id] = fmt_dash_stats(stats[ent_id])
+            continue
+
+        pts_for[ent_id] = fmt_dash_scores(ent_pts, prev_team_pts[ent_id])
+        pts_against[ent_id] = fmt_dash_scores(ent_opp, prev_opp_pts[ent_id])
+
+        stats[ent_id] = get_stats(ent)
+        stats_fmt[ent_id] = fmt_dash_stats(stats[ent_id], prev_stats[ent_id])
+
+        if reuse_mvmt:
+            mvmt[ent_id] = prev_mvmt.get(ent_id, '')
+            colcls[ent_id] = prev_colcls.get(ent_id, '')
+        elif prev_stats[ent_id][-1]:
+            rank_diff = (prev_stats[ent_id][-1] or 0) - (getattr(ent, rank_attr) or 0)
+            if rank_diff:
+                mvmt[ent_id] = MVMT_STR.get(rank_diff) or Markup(f"{rank_diff:+d}")
+                colcls[ent_id] = COLCLS_UP if rank_diff > 0 else COLCLS_DOWN
+        if ent_id not in mvmt:
+            mvmt[ent_id] = DASH_NONE
+            colcls[ent_id] = ''
+
+    context.update({
+        'updated'     : updated,
+        'done'        : done,
+        'win_tallies' : win_tallies,
+        'loss_tallies': loss_tallies,
+        'pts_for'     : pts_for,
+        'pts_against' : pts_against,
+        'stats_fmt'   : stats_fmt,
+        'mvmt'        : mvmt,
+        'colcls'      : colcls
+    })
+    html = render_dash(context)
 
-    updated = now_str()
     if tot_pts > prev_tot_pts:
-        session[SD_DASH_KEY] = {
+        frame_html = html
+        if not prev_stats:
+            # the next (unchanged) frame shows the movement default for all entities, so
+            # that is what we cache for reuse by `cached_score_dash`
+            context['mvmt'] = dict.fromkeys(ids, DASH_NONE)
+            context['colcls'] = dict.fromkeys(ids, '')
+            frame_html = render_dash(context)
+        DASH_FRAMES[tourn.name, dash_key] = {
+            'created_at' : tourn.created_at,
             'updated'    : updated,
             'done'       : done,
             'tot_gms'    : tot_gms,
@@ -298,32 +398,51 @@ def sd_dash(tourn: TournInfo) -> str:
             'stats'      : stats,
             'stats_fmt'  : stats_fmt,
             'mvmt'       : mvmt,
-            'colcls'     : colcls
+            'colcls'     : colcls,
+            'html'       : frame_html
         }
+    return html
+
+###########
+# sd_dash #
+###########
+
+# value: (win_pct, pos, pts_pct, rank)
+SD_STATS = ('seed_win_pct', 'player_pos_str', 'seed_pts_pct', 'player_rank_final')
+
+def sd_dash(tourn: TournInfo) -> str:
+    """Render seed round live dashboard
+    """
+    update_int = DASH_UPDATE_INT - SD_UPDATE_ADJ
+    done = tourn.seeding_done()
+
+    pg_list  = list(PlayerGame.iter_game_rows(include_byes=True))
+    # note that we only need to fetch and sort players if something has changed
+    if html := cached_score_dash(tourn, done, SD_DASH_KEY, pg_list):
+        return html
+
+    sort_key = lambda pl: pl.player_rank_final or tourn.players
+    pl_list  = sorted(Player.iter_players(), key=sort_key)
 
     context = {
         'dash_num'    : 0,
         'title'       : SD_DASH,
-        'updated'     : updated,
         'update_int'  : update_int,
-        'done'        : done,
         'tourn'       : tourn,
         'rnds'        : tourn.seed_rounds,
-        'players'     : pl_list,
-        'win_tallies' : win_tallies,
-        'loss_tallies': loss_tallies,
-        'pts_for'     : pts_for,
-        'pts_against' : pts_against,
-        'stats_fmt'   : stats_fmt,
-        'mvmt'        : mvmt,
-        'colcls'      : colcls
+        'players'     : pl_list
     }
-    return render_dash(context)
+    return render_score_dash(tourn, done, SD_DASH_KEY, tourn.seed_rounds, pl_list,
+                             'player_num', pg_list, 'player_num', SD_STATS, context)
 
 ###########
 # rr_dash #
 ###########
 
+# value: (win_pct, pos, pts_pct, tb_win_rec, tb_pts_pct, rank)
+RR_STATS = ('tourn_win_pct', 'div_pos_str', 'tourn_pts_pct', 'div_tb_win_rec',
+            'div_tb_pts_pct', 'div_rank_final')
+
 def rr_dash(tourn: TournInfo) -> str:
     """Render round robin live dashboard
     """
@@ -331,192 +450,29 @@ def rr_dash(tourn: TournInfo) -> str:
     done = tourn.round_robin_done()
 
     div_list = list(range(1, tourn.divisions + 1))
+    tg_list  = list(TeamGame.iter_game_rows(include_byes=True))
+    # note that we only need to fetch and sort teams if something has changed
+    if html := cached_score_dash(tourn, done, RR_DASH_KEY, tg_list):
+        return html
+
     sort_key = lambda tm: tm.div_rank_final or tourn.teams
     tm_list  = sorted(Team.iter_teams(), key=sort_key)
-    # inner dict represents points by round {rnd: pts}
-    team_pts = {tm.id: {} for tm in tm_list}
-    opp_pts  = {tm.id: {} for tm in tm_list}
-    wins     = {tm.id: 0 for tm in tm_list}
-    losses   = {tm.id: 0 for tm in tm_list}
-    tot_gms  = 0
-    tot_pts  = 0
-
-    tg_list = list(TeamGame.iter_games(include_byes=True))
-    not_bye = lambda g: not g.is_bye
-    max_rnd = lambda ls: max(g.round_num for g in ls) if ls else 0
-    cur_rnd = {div: max_rnd(list(filter(not_bye, tg_list))) for div in div_list}
-    for tg in tg_list:
-        div = tg.team.div_num
-        tm_id = tg.team_id
-        assert tm_id == tg.team.id
-        rnd = tg.round_num
-        assert rnd not in team_pts[tm_id]
-        assert rnd not in opp_pts[tm_id]
-        if not tg.is_bye:
-            tot_gms += 1
-            tot_pts += tg.team_pts
-            team_pts[tm_id][rnd] = tg.team_pts
-            opp_pts[tm_id][rnd] = tg.opp_pts
-            if tg.is_winner:
-                wins[tm_id] += 1
-            else:
-                losses[tm_id] += 1
-        elif rnd <= cur_rnd[div]:
-            team_pts[tm_id][rnd] = -1
-            opp_pts[tm_id][rnd] = -1
 
-    prev_tot_gms     = 0
-    prev_tot_pts     = 0
-    prev_team_pts    = {}
-    prev_opp_pts     = {}
-    prev_pts_for     = {}
-    prev_pts_against = {}
-    prev_stats       = None
-    prev_stats_fmt   = None
-    prev_mvmt        = None
-    prev_colcls      = None
-    if prev_frame := session.get(RR_DASH_KEY):
-        if str(tourn.created_at) > prev_frame['updated']:
-            session.pop(RR_DASH_KEY)
-        else:
-            prev_tot_gms     = prev_frame['tot_gms']
-            prev_tot_pts     = prev_frame['tot_pts']
-            prev_team_pts    = prev_frame['team_pts']
-            prev_opp_pts     = prev_frame['opp_pts']
-            prev_pts_for     = prev_frame['pts_for']
-            prev_pts_against = prev_frame['pts_against']
-            prev_stats       = prev_frame['stats']
-            prev_stats_fmt   = prev_frame['stats_fmt']
-            prev_mvmt        = prev_frame['mvmt']
-            prev_colcls      = prev_frame['colcls']
-
-    div_teams    = {div: [] for div in div_list}
-    # the following are all keyed off of team id
-    win_tallies  = {}
-    loss_tallies = {}
-    stats        = {}  # value: (win_pct, pts_pct, rank)
-    stats_fmt    = {}  # value: (win_pct, pts_pct, rank)
-    mvmt         = {}
-    colcls       = {}
-    # inner dict represents points (formatted!) by round
-    pts_for      = {tm.id: {} for tm in tm_list}
-    pts_against  = {tm.id: {} for tm in tm_list}
+    div_teams = {div: [] for div in div_list}
     for tm in tm_list:
-        div = tm.div_num
-        tm_id = tm.id
-        div_teams[div].append(tm)
-
-        # we always (re-)format win/loss tallies (for now)
-        win_tallies[tm_id] = fmt_tally(wins[tm_id])
-        loss_tallies[tm_id] = fmt_tally(losses[tm_id])
-
-        # conditionally, we either format or reuse string values for pts_for/_agnst,
-        # stats, mvmt, and colcls (always recompute if done)
-        if prev_stats:
-            if tot_pts == prev_tot_pts and not done:
-                pts_for[tm_id] = prev_pts_for[tm_id]
-                pts_against[tm_id] = prev_pts_against[tm_id]
-                stats_fmt[tm_id] = prev_stats_fmt[tm_id]
-            else:
-                for rnd, cur_pts in team_pts[tm_id].items():
-                    prev_pts = prev_team_pts[tm_id].get(rnd)
-                    pts_for[tm_id][rnd] = fmt_dash_score(cur_pts, prev_pts)
-                for rnd, cur_pts in opp_pts[tm_id].items():
-                    prev_pts = prev_opp_pts[tm_id].get(rnd)
-                    pts_against[tm_id][rnd] = fmt_dash_score(cur_pts, prev_pts)
-
-                stats[tm_id] = (
-                    tm.tourn_win_pct,
-                    tm.div_pos_str,
-                    tm.tourn_pts_pct,
-                    tm.div_tb_win_rec,
-                    tm.div_tb_pts_pct,
-                    tm.div_rank_final
-                )
-                stats_fmt[tm_id] = (
-                    fmt_dash_stat(stats[tm_id][0], prev_stats[tm_id][0], no_style=True),
-                    fmt_dash_stat(stats[tm_id][1], prev_stats[tm_id][1], no_style=True),
-                    fmt_dash_stat(stats[tm_id][2], prev_stats[tm_id][2], no_style=True),
-                    fmt_dash_stat(stats[tm_id][3], prev_stats[tm_id][3], no_style=True),
-                    fmt_dash_stat(stats[tm_id][4], prev_stats[tm_id][4], no_style=True),
-                    fmt_dash_stat(stats[tm_id][5], prev_stats[tm_id][5])
-                )
-
-            if tot_pts == prev_tot_pts and prev_mvmt:
-                mvmt[tm_id] = prev_mvmt.get(tm_id, '')
-                colcls[tm_id] = prev_colcls.get(tm_id, '')
-            elif prev_stats[tm_id][5]:
-                rank_diff = (prev_stats[tm_id][5] or 0) - (tm.div_rank_final or 0)
-                if rank_diff > 0:
-                    mvmt[tm_id] = f'+{rank_diff}'
-                    colcls[tm_id] = COLCLS_UP
-                elif rank_diff < 0:
-                    mvmt[tm_id] = str(rank_diff)
-                    colcls[tm_id] = COLCLS_DOWN
-            if tm_id not in mvmt:
-                mvmt[tm_id] = '&ndash;'
-                colcls[tm_id] = ''
-        else:
-            for rnd, cur_pts in team_pts[tm_id].items():
-                pts_for[tm_id][rnd] = fmt_dash_score(cur_pts)
-            for rnd, cur_pts in opp_pts[tm_id].items():
-                pts_against[tm_id][rnd] = fmt_dash_score(cur_pts)
-
-            stats[tm_id] = (
-                tm.tourn_win_pct,
-                tm.div_pos_str,
-                tm.tourn_pts_pct,
-                tm.div_tb_win_rec,
-                tm.div_tb_pts_pct,
-                tm.div_rank_final
-            )
-            stats_fmt[tm_id] = (
-                fmt_dash_stat(stats[tm_id][0], no_style=True),
-                fmt_dash_stat(stats[tm_id][1], no_style=True),
-                fmt_dash_stat(stats[tm_id][2], no_style=True),
-                fmt_dash_stat(stats[tm_id][3], no_style=True),
-                fmt_dash_stat(stats[tm_id][4], no_style=True),
-                fmt_dash_stat(stats[tm_id][5])
-            )
-
-    updated = now_str()
-    if tot_pts > prev_tot_pts:
-        session[RR_DASH_KEY] = {
-            'updated'    : updated,
-            'done'       : done,
-            'tot_gms'    : tot_gms,
-            'tot_pts'    : tot_pts,
-            'wins'       : wins,
-            'losses'     : losses,
-            'team_pts'   : team_pts,
-            'opp_pts'    : opp_pts,
-            'pts_for'    : pts_for,
-            'pts_against': pts_against,
-            'stats'      : stats,
-            'stats_fmt'  : stats_fmt,
-            'mvmt'       : mvmt,
-            'colcls'     : colcls
-        }
+        div_teams[tm.div_num].append(tm)
 
     context = {
         'dash_num'    : 1,
         'title'       : RR_DASH,
-        'updated'     : updated,
         'update_int'  : update_int,
-        'done'        : done,
         'tourn'       : tourn,
         'rnds'        : tourn.tourn_rounds,
         'div_list'    : div_list,
-        'div_teams'   : div_teams,
-        'win_tallies' : win_tallies,
-        'loss_tallies': loss_tallies,
-        'pts_for'     : pts_for,
-        'pts_against' : pts_against,
-        'stats_fmt'   : stats_fmt,
-        'mvmt'        : mvmt,
-        'colcls'      : colcls
+        'div_teams'   : div_teams
     }
-    return render_dash(context)
+    return render_score_dash(tourn, done, RR_DASH_KEY, tourn.tourn_rounds, tm_list, 'id',
+                             tg_list, 'team_id', RR_STATS, context)
 
 ###########
 # pt_dash #
@@ -535,18 +491,19 @@ def pt_dash(tourn: TournInfo) -> str:
     num_avail   = len(picks_avail)
     prev_count  = 0
 
-    if prev_frame := session.get(PT_DASH_KEY):
-        if str(tourn.created_at) > prev_frame['updated']:
-            session.pop(PT_DASH_KEY)
+    if prev_frame := DASH_FRAMES.get((tourn.name, PT_DASH_KEY)):
+        if tourn.created_at != prev_frame['created_at']:
+            DASH_FRAMES.pop((tourn.name, PT_DASH_KEY), None)
         else:
             prev_count = prev_frame['num_picks']
 
     updated = now_str()
     if num_picks > prev_count:
-        session[PT_DASH_KEY] = {
-            'updated'  : updated,
-            'done'     : done,
-            'num_picks': num_picks
+        DASH_FRAMES[tourn.name, PT_DASH_KEY] = {
+            'created_at': tourn.created_at,
+            'updated'   : updated,
+            'done'      : done,
+            'num_picks' : num_picks
         }
 
     context = {
@@ -588,28 +545,28 @@ def ff_dash(tourn: TournInfo) -> str:
     ncomplete = 0
     prev_count  = 0
 
-    by_matchup = PlayoffGame.iter_games(by_matchup=True)
-    for k, g in groupby(by_matchup, key=lambda x: x.matchup_ident):
-        matchup = k
-        games = list(g)
-        team1 = games[0].team1
-        team2 = games[0].team2
-        winner = games[0].matchup_winner
-        brckt_info[matchup] = (team1, team2, winner, games)
-        ncomplete += sum(1 for x in games if x.winner)
-
-    if prev_frame := session.get(FF_DASH_KEY):
-        if str(tourn.created_at) > prev_frame['updated']:
-            session.pop(FF_DASH_KEY)
+    # matchup info is taken from the first game for each matchup
+    for gm in PlayoffGame.iter_games(by_matchup=True):
+        if info := brckt_info.get(gm.matchup_ident):
+            info[3].append(gm)
+        else:
+            brckt_info[gm.matchup_ident] = (gm.team1, gm.team2, gm.matchup_winner, [gm])
+        if gm.winner:
+            ncomplete += 1
+
+    if prev_frame := DASH_FRAMES.get((tourn.name, FF_DASH_KEY)):
+        if tourn.created_at != prev_frame['created_at']:
+            DASH_FRAMES.pop((tourn.name, FF_DASH_KEY), None)
         else:
             prev_count = prev_frame['ncomplete']
 
     updated = now_str()
     if ncomplete > prev_count:
-        session[FF_DASH_KEY] = {
-            'updated'  : updated,
-            'done'     : done,
-            'ncomplete': ncomplete
+        DASH_FRAMES[tourn.name, FF_DASH_KEY] = {
+            'created_at': tourn.created_at,
+            'updated'   : updated,
+            'done'      : done,
+            'ncomplete' : ncomplete
         }
 
     context = {
@@ -623,3 +580,8 @@ def ff_dash(tourn: TournInfo) -> str:
         'fmt_scores': fmt_scores
     }
     return render_bracket(context)
+
+# dispatch table for `get_dash` (must follow all dash function definitions)
+DASH_DISPATCH: dict[str, Callable[[TournInfo], str]] = {
+    dash: globals()[dash] for dash in DASH_FUNCS
+}
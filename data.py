@@ -5,14 +5,21 @@
 NOTE: currently includes data layout information (but need to refactor/reconcile data with
 view management).
 """
+from collections.abc import Callable, Iterable
+from functools import wraps
+from operator import attrgetter
+import time
+
 from ckautils import typecast
 from peewee import IntegrityError
-from flask import Blueprint, g, request
+from flask import Blueprint, Response, g, request, make_response
 
 from security import login_required
+from database import db_atomic
 from schema import Bracket, TournStage, TournInfo
 from euchmgr import compute_player_ranks, compute_team_ranks, compute_playoff_ranks
-from ui_schema import Player, PartnerPick, SeedGame, Team, TournGame, PlayoffGame
+from ui_common import conditional_response
+from ui_schema import Player, SeedGame, Team, TournGame, PlayoffGame
 
 ###################
 # blueprint stuff #
@@ -27,9 +34,74 @@ EDITABLE = 'editable'
 
 Layout = list[tuple[str, str, str]]
 
-# error string/message tuples
-MISSING_FORM_FIELDS = ("'NoneType' object has no attribute 'lstrip'",
-                       "Missing field(s) in form data")
+# version of the tournament data, bumped upon completion of every POST request (i.e. not
+# only the handlers here, but also admin and mobile actions); GET responses are tagged
+# with the version, so that unchanged re-polls can be answered ("304 Not Modified")
+# before any rows are fetched.  Note that the counter is kept in process memory, so the
+# process start time is included in the tag.
+DATA_START_TIME = time.time_ns()
+data_version = 0
+
+@data.teardown_app_request
+def bump_data_version(exc: BaseException | None) -> None:
+    """Bump the data version after any request that may have updated the database.
+    """
+    global data_version
+    if request.method == 'POST':
+        data_version += 1
+
+def data_etag() -> str:
+    """Return entity tag for the current version of the tournament data.
+    """
+    tourn = TournInfo.get()
+    return f"{DATA_START_TIME:x}-{tourn.name}-{data_version}"
+
+def versioned(func: Callable) -> Callable:
+    """Decorator for GET handlers, which tags the response with the current data version
+    (see `data_etag`), and returns "304 Not Modified" without calling the handler if the
+    client already has that version.  Note that the tag is determined before the handler
+    fetches any data, so it never claims a newer version than what is returned.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        etag = data_etag()
+        if request.if_none_match.contains(etag):
+            return conditional_response(Response(), etag)
+        resp = make_response(func(*args, **kwargs))
+        if resp.status_code != 200:
+            return resp
+        return conditional_response(resp, etag)
+    return wrapper
+
+# error messages
+MISSING_FORM_FIELDS = "Missing field(s) in form data"
+
+def missing_fields(form: dict, fields: Iterable[str]) -> bool:
+    """Return True if any of the specified fields are missing from the form data (checked
+    up front, rather than letting `typecast` fail on `None`).
+    """
+    return any(form.get(k) is None for k in fields)
+
+def row_builder(props: list[str]) -> Callable[[object, dict], dict]:
+    """Return function that builds the row data for a record, given its base data dict,
+    by adding the specified properties (attribute lookups bound up front).  The base dict
+    is copied once and the properties written into it directly, without building an
+    intermediate dict for them.
+    """
+    getter = attrgetter(*props)
+    if len(props) == 1:
+        # note that attrgetter returns a bare value (not a tuple) for a single attribute
+        prop = props[0]
+        def build_row(obj: object, data: dict) -> dict:
+            row = dict(data)
+            row[prop] = getter(obj)
+            return row
+    else:
+        def build_row(obj: object, data: dict) -> dict:
+            row = dict(data)
+            row.update(zip(props, getter(obj)))
+            return row
+    return build_row
 
 ##########
 # /tourn #
@@ -41,6 +113,7 @@ tn_upd_flds = {'dates', 'venue'}
 
 @data.get("/tourn/data")
 @login_required
+@versioned
 def get_tourn() -> dict:
     """Return the data for the current tournament as a single JSON object (unlike the
     other GET methods in this module, which return lists).
@@ -55,22 +128,19 @@ def post_tourn() -> dict:
     """Update TournInfo data.
     """
     data = request.form
+    if missing_fields(data, ('id', *tn_upd_flds)):
+        return ajax_error(MISSING_FORM_FIELDS)
     tourn = TournInfo.get()
     tn_data = None
 
-    try:
-        upd_info = {k: typecast(data.get(k)) for k in tn_upd_flds}
-        if typecast(data.get('id')) != tourn.id:
-            ajax_error("Invalid 'id' specified")
-        for col, val in upd_info.items():
-            setattr(tourn, col, val)
-        mod = tourn.save()
-        if mod:
-            tn_data = tourn.tourn_data
-    except AttributeError as e:
-        if str(e) == MISSING_FORM_FIELDS[0]:
-            return ajax_error(MISSING_FORM_FIELDS[1])
-        raise
+    upd_info = {k: typecast(data.get(k)) for k in tn_upd_flds}
+    if typecast(data.get('id')) != tourn.id:
+        return ajax_error("Invalid 'id' specified")
+    for col, val in upd_info.items():
+        setattr(tourn, col, val)
+    mod = tourn.save()
+    if mod:
+        tn_data = tourn.tourn_data
 
     return ajax_data(tn_data)
 
@@ -84,6 +154,7 @@ pl_addl_props = [
     'seed_win_pct_str',
     'seed_pts_pct_str'
 ]
+pl_row = row_builder(pl_addl_props)
 
 pl_layout = [
     ('id',               "ID",          HIDDEN),
@@ -99,17 +170,18 @@ pl_layout = [
     ('seed_pts_pct_str', "Pts Pct",     None),
     ('player_rank',      "Seed Rank",   None)
 ]
+pl_editable = tuple(x[0] for x in pl_layout if x[2] == EDITABLE)
 
 @data.get("/players/data")
 @login_required
+@versioned
 def get_players() -> dict:
     """
     """
     pl_iter = Player.iter_players()
     pl_data = []
     for player in pl_iter:
-        pl_props = {prop: getattr(player, prop) for prop in pl_addl_props}
-        pl_data.append(player.player_data | pl_props)
+        pl_data.append(pl_row(player, player.player_data))
 
     return ajax_data(pl_data)
 
@@ -119,21 +191,18 @@ def post_players() -> dict:
     """
     """
     data = request.form
+    if missing_fields(data, ('id', *pl_editable)):
+        return ajax_error(MISSING_FORM_FIELDS)
     pl_data = None
 
     try:
         player = Player[typecast(data.get('id'))]
-        upd_info = {x[0]: typecast(data.get(x[0])) for x in pl_layout if x[2] == EDITABLE}
+        upd_info = {k: typecast(data.get(k)) for k in pl_editable}
         for col, val in upd_info.items():
             setattr(player, col, val)
         mod = player.save()
         if mod:
-            pl_props = {prop: getattr(player, prop) for prop in pl_addl_props}
-            pl_data = player.player_data | pl_props
-    except AttributeError as e:
-        if str(e) == MISSING_FORM_FIELDS[0]:
-            return ajax_error(MISSING_FORM_FIELDS[1])
-        raise
+            pl_data = pl_row(player, player.player_data)
     except TypeError as e:
         return ajax_error("Invalid type specified")
     except (IntegrityError, ValueError) as e:
@@ -150,6 +219,7 @@ def post_players() -> dict:
 sg_addl_props = [
     'player_nums'
 ]
+sg_row = row_builder(sg_addl_props)
 
 sg_layout = [
     ('id',          "ID",          HIDDEN),
@@ -163,17 +233,18 @@ sg_layout = [
     ('team2_pts',   "Team 2 Pts",  EDITABLE),
     ('winner',      "Winner",      None)
 ]
+sg_editable = tuple(x[0] for x in sg_layout if x[2] == EDITABLE)
 
 @data.get("/seeding/data")
 @login_required
+@versioned
 def get_seeding() -> dict:
     """
     """
     sg_iter = SeedGame.iter_games(include_byes=True)
     sg_data = []
     for game in sg_iter:
-        sg_props = {prop: getattr(game, prop) for prop in sg_addl_props}
-        sg_data.append(game.__data__ | sg_props)
+        sg_data.append(sg_row(game, game.__data__))
 
     return ajax_data(sg_data)
 
@@ -183,30 +254,28 @@ def post_seeding() -> dict:
     """Post scrores to seeding round game.
     """
     data = request.form
+    if missing_fields(data, ('id', *sg_editable)):
+        return ajax_error(MISSING_FORM_FIELDS)
     sg_data = None
 
     try:
-        # TODO: wrap this entire try block in a transaction!!!
-        game = SeedGame[typecast(data.get('id'))]
-        upd_info = {x[0]: typecast(data.get(x[0])) for x in sg_layout if x[2] == EDITABLE}
-        team1_pts = upd_info.pop('team1_pts')
-        team2_pts = upd_info.pop('team2_pts')
-        assert len(upd_info) == 0
-        game.add_scores(team1_pts, team2_pts)
-        game.save()
-
-        if game.winner:
-            game.update_player_stats()
-            game.insert_player_games()
-            compute_player_ranks()
-            if SeedGame.current_round() == -1:
-                TournInfo.mark_stage_complete(TournStage.SEED_RESULTS)
-            sg_props = {prop: getattr(game, prop) for prop in sg_addl_props}
-            sg_data = game.__data__ | sg_props
-    except AttributeError as e:
-        if str(e) == MISSING_FORM_FIELDS[0]:
-            return ajax_error(MISSING_FORM_FIELDS[1])
-        raise
+        # all updates for the game are committed (or rolled back) together
+        with db_atomic():
+            game = SeedGame[typecast(data.get('id'))]
+            upd_info = {k: typecast(data.get(k)) for k in sg_editable}
+            team1_pts = upd_info.pop('team1_pts')
+            team2_pts = upd_info.pop('team2_pts')
+            assert len(upd_info) == 0
+            game.add_scores(team1_pts, team2_pts)
+            game.save()
+
+            if game.winner:
+                game.update_player_stats()
+                game.insert_player_games()
+                compute_player_ranks()
+                if SeedGame.current_round() == -1:
+                    TournInfo.mark_stage_complete(TournStage.SEED_RESULTS)
+                sg_data = sg_row(game, game.__data__)
     except TypeError as e:
         return ajax_error("Invalid type specified")
     except RuntimeError as e:
@@ -226,6 +295,7 @@ pt_addl_props = [
     'picks_info',
     'picked_by_info'
 ]
+pt_row = row_builder(pt_addl_props)
 
 pt_layout = [
     ('id',             "ID",         HIDDEN),
@@ -238,9 +308,11 @@ pt_layout = [
     ('picks_info',     "Partner(s) (pick by Name or Rank)", EDITABLE),
     ('picked_by_info', "Picked By",  None)
 ]
+pt_editable = tuple(x[0] for x in pt_layout if x[2] == EDITABLE)
 
 @data.get("/partners/data")
 @login_required
+@versioned
 def get_partners() -> dict:
     """Ajax call to load datatable for partners view.
     """
@@ -248,11 +320,10 @@ def get_partners() -> dict:
     if tourn.stage_compl < TournStage.SEED_RANKS:
         return ajax_data([])
 
-    pt_iter = Player.iter_players(by_rank=True)
+    pt_iter = Player.iter_players(by_rank=True, join_picks=True)
     pt_data = []
     for player in pt_iter:
-        pt_props = {prop: getattr(player, prop) for prop in pt_addl_props}
-        pt_data.append(player.player_data | pt_props)
+        pt_data.append(pt_row(player, player.player_data))
 
     return ajax_data(pt_data)
 
@@ -263,30 +334,36 @@ def post_partners() -> dict:
     the `id` and `picks_info` fields.
     """
     data = request.form
+    if missing_fields(data, ('id', *pt_editable)):
+        return ajax_error(MISSING_FORM_FIELDS)
     pt_data = None
 
     try:
-        player = Player[typecast(data.get('id'))]
-        upd_info = {x[0]: typecast(data.get(x[0])) for x in pt_layout if x[2] == EDITABLE}
-        # TODO: add support for `partner_num` (in addition to `picks_info`)!!!
-        picks_info = upd_info.pop('picks_info')
-        assert len(upd_info) == 0
-
-        if isinstance(picks_info, bool) or picks_info is None:
-            # revert over-aggressive typecasting (could mask viable matches)
-            picks_info = data.get('picks_info')
-        partners, avail = player.pick_partners(picks_info)
-        player.set_partners(*partners)
-        player.save(cascade=True)
-
-        # see "KINDA HOKEY" comment about this button stuff in post_playoffs() below
-        enable_button = None
-        if PartnerPick.current_round() == -1:
-            TournInfo.mark_stage_complete(TournStage.PARTNER_PICK)
-            enable_button = 'comp_team_seeds'
-        pt_data = {'reloadTable': True}
-        if enable_button:
-            pt_data['enableButton'] = enable_button
+        # partner updates (and stage completion) are committed together
+        with db_atomic():
+            player = Player[typecast(data.get('id'))]
+            upd_info = {k: typecast(data.get(k)) for k in pt_editable}
+            # TODO: add support for `partner_num` (in addition to `picks_info`)!!!
+            picks_info = upd_info.pop('picks_info')
+            assert len(upd_info) == 0
+
+            if isinstance(picks_info, bool) or picks_info is None:
+                # revert over-aggressive typecasting (could mask viable matches)
+                picks_info = data.get('picks_info')
+            partners, avail = player.pick_partners(picks_info)
+            player.set_partners(*partners)
+            player.save(cascade=True)
+
+            # see "KINDA HOKEY" comment about this button stuff in post_playoffs() below
+            enable_button = None
+            # `avail` (players left after this pick) being empty is equivalent to
+            # `PartnerPick.current_round() == -1`, without requerying the pick count
+            if not avail:
+                TournInfo.mark_stage_complete(TournStage.PARTNER_PICK)
+                enable_button = 'comp_team_seeds'
+            pt_data = {'reloadTable': True}
+            if enable_button:
+                pt_data['enableButton'] = enable_button
     except RuntimeError as e:
         return ajax_error(str(e))
 
@@ -302,6 +379,7 @@ tm_addl_props = [
     'tourn_win_pct_str',
     'tourn_pts_pct_str'
 ]
+tm_row = row_builder(tm_addl_props)
 
 tm_layout = [
     ('id',                "ID",          HIDDEN),
@@ -320,17 +398,18 @@ tm_layout = [
     ('div_rank',          "Div Rank",    None),
     ('final_rank',        "Tourn Rank",  None)
 ]
+tm_editable = tuple(x[0] for x in tm_layout if x[2] == EDITABLE)
 
 @data.get("/teams/data")
 @login_required
+@versioned
 def get_teams() -> dict:
     """
     """
     tm_iter = Team.iter_teams()
     tm_data = []
     for team in tm_iter:
-        tm_props = {prop: getattr(team, prop) for prop in tm_addl_props}
-        tm_data.append(team.team_data | tm_props)
+        tm_data.append(tm_row(team, team.team_data))
 
     return ajax_data(tm_data)
 
@@ -340,24 +419,20 @@ def post_teams() -> dict:
     """
     """
     data = request.form
+    if missing_fields(data, ('id', *tm_editable)):
+        return ajax_error(MISSING_FORM_FIELDS)
     tm_data = None
 
-    try:
-        team = Team[typecast(data.get('id'))]
-        upd_info = {x[0]: typecast(data.get(x[0])) for x in tm_layout if x[2] == EDITABLE}
-        for col, val in upd_info.items():
-            setattr(team, col, val)
-        team.save()
-
-        # NOTE: no need to update row data for now (LATER, may need this if denorm or
-        # derived fields are updated when saving)
-        if False:
-            tm_props = {prop: getattr(team, prop) for prop in tm_addl_props}
-            tm_data = team.team_data | tm_props
-    except AttributeError as e:
-        if str(e) == MISSING_FORM_FIELDS[0]:
-            return ajax_error(MISSING_FORM_FIELDS[1])
-        raise
+    team = Team[typecast(data.get('id'))]
+    upd_info = {k: typecast(data.get(k)) for k in tm_editable}
+    for col, val in upd_info.items():
+        setattr(team, col, val)
+    team.save()
+
+    # NOTE: no need to update row data for now (LATER, may need this if denorm or
+    # derived fields are updated when saving)
+    if False:
+        tm_data = tm_row(team, team.team_data)
 
     return ajax_data(tm_data)
 
@@ -368,6 +443,7 @@ def post_teams() -> dict:
 tg_addl_props = [
     'team_seeds'
 ]
+tg_row = row_builder(tg_addl_props)
 
 tg_layout = [
     ('id',         "ID",         HIDDEN),
@@ -382,17 +458,18 @@ tg_layout = [
     ('team2_pts',  "Team 2 Pts", EDITABLE),
     ('winner',     "Winner",     None)
 ]
+tg_editable = tuple(x[0] for x in tg_layout if x[2] == EDITABLE)
 
 @data.get("/round_robin/data")
 @login_required
+@versioned
 def get_round_robin() -> dict:
     """
     """
     tg_iter = TournGame.iter_games(include_byes=True)
     tg_data = []
     for game in tg_iter:
-        tg_props = {prop: getattr(game, prop) for prop in tg_addl_props}
-        tg_data.append(game.__data__ | tg_props)
+        tg_data.append(tg_row(game, game.__data__))
 
     return ajax_data(tg_data)
 
@@ -402,30 +479,28 @@ def post_round_robin() -> dict:
     """
     """
     data = request.form
+    if missing_fields(data, ('id', *tg_editable)):
+        return ajax_error(MISSING_FORM_FIELDS)
     tg_data = None
 
     try:
-        # TODO: wrap this entire try block in a transaction!!!
-        game = TournGame[typecast(data.get('id'))]
-        upd_info = {x[0]: typecast(data.get(x[0])) for x in tg_layout if x[2] == EDITABLE}
-        team1_pts = upd_info.pop('team1_pts')
-        team2_pts = upd_info.pop('team2_pts')
-        assert len(upd_info) == 0
-        game.add_scores(team1_pts, team2_pts)
-        game.save()
-
-        if game.winner:
-            game.update_team_stats()
-            game.insert_team_games()
-            compute_team_ranks()
-            if TournGame.current_round() == -1:
-                TournInfo.mark_stage_complete(TournStage.TOURN_RESULTS)
-            tg_props = {prop: getattr(game, prop) for prop in tg_addl_props}
-            tg_data = game.__data__ | tg_props
-    except AttributeError as e:
-        if str(e) == MISSING_FORM_FIELDS[0]:
-            return ajax_error(MISSING_FORM_FIELDS[1])
-        raise
+        # all updates for the game are committed (or rolled back) together
+        with db_atomic():
+            game = TournGame[typecast(data.get('id'))]
+            upd_info = {k: typecast(data.get(k)) for k in tg_editable}
+            team1_pts = upd_info.pop('team1_pts')
+            team2_pts = upd_info.pop('team2_pts')
+            assert len(upd_info) == 0
+            game.add_scores(team1_pts, team2_pts)
+            game.save()
+
+            if game.winner:
+                game.update_team_stats()
+                game.insert_team_games()
+                compute_team_ranks()
+                if TournGame.current_round() == -1:
+                    TournInfo.mark_stage_complete(TournStage.TOURN_RESULTS)
+                tg_data = tg_row(game, game.__data__)
     except TypeError as e:
         return ajax_error("Invalid type specified")
     except RuntimeError as e:
@@ -444,6 +519,7 @@ ff_addl_props = [
     'playoff_win_pct_str',
     'playoff_pts_pct_str'
 ]
+ff_row = row_builder(ff_addl_props)
 
 ff_layout = [
     ('id',                   "ID",           HIDDEN),
@@ -460,17 +536,18 @@ ff_layout = [
     ('playoff_pts_pct_str',  "Pts Pct",      None),
     ('playoff_rank',         "Playoff Rank", None)
 ]
+ff_editable = tuple(x[0] for x in ff_layout if x[2] == EDITABLE)
 
 @data.get("/final_four/data")
 @login_required
+@versioned
 def get_final_four() -> dict:
     """
     """
     ff_iter = Team.iter_playoff_teams(by_rank=True)
     ff_data = []
     for team in ff_iter:
-        ff_props = {prop: getattr(team, prop) for prop in ff_addl_props}
-        ff_data.append(team.final_four_data | ff_props)
+        ff_data.append(ff_row(team, team.final_four_data))
 
     return ajax_data(ff_data)
 
@@ -480,24 +557,20 @@ def post_final_four() -> dict:
     """
     """
     data = request.form
+    if missing_fields(data, ('id', *ff_editable)):
+        return ajax_error(MISSING_FORM_FIELDS)
     ff_data = None
 
-    try:
-        team = Team[typecast(data.get('id'))]
-        upd_info = {x[0]: typecast(data.get(x[0])) for x in ff_layout if x[2] == EDITABLE}
-        for col, val in upd_info.items():
-            setattr(team, col, val)
-        team.save()
-
-        # NOTE: no need to update row data for now (LATER, may need this if denorm or
-        # derived fields are updated when saving)
-        if False:
-            ff_props = {prop: getattr(team, prop) for prop in ff_addl_props}
-            ff_data = team.team_data | ff_props
-    except AttributeError as e:
-        if str(e) == MISSING_FORM_FIELDS[0]:
-            return ajax_error(MISSING_FORM_FIELDS[1])
-        raise
+    team = Team[typecast(data.get('id'))]
+    upd_info = {k: typecast(data.get(k)) for k in ff_editable}
+    for col, val in upd_info.items():
+        setattr(team, col, val)
+    team.save()
+
+    # NOTE: no need to update row data for now (LATER, may need this if denorm or
+    # derived fields are updated when saving)
+    if False:
+        ff_data = ff_row(team, team.team_data)
 
     return ajax_data(ff_data)
 
@@ -509,6 +582,7 @@ pg_addl_props = [
     'bracket_ident',
     'team_ranks'
 ]
+pg_row = row_builder(pg_addl_props)
 
 pg_layout = [
     ('id',            "ID",         HIDDEN),
@@ -523,17 +597,18 @@ pg_layout = [
     ('team2_pts',     "Team 2 Pts", EDITABLE),
     ('winner',        "Winner",     None)
 ]
+pg_editable = tuple(x[0] for x in pg_layout if x[2] == EDITABLE)
 
 @data.get("/playoffs/data")
 @login_required
+@versioned
 def get_playoffs() -> dict:
     """
     """
-    pg_iter = PlayoffGame.iter_games()
+    pg_iter = PlayoffGame.iter_games(join_teams=True)
     pg_data = []
     for game in pg_iter:
-        pg_props = {prop: getattr(game, prop) for prop in pg_addl_props}
-        pg_data.append(game.__data__ | pg_props)
+        pg_data.append(pg_row(game, game.__data__))
 
     return ajax_data(pg_data)
 
@@ -543,49 +618,47 @@ def post_playoffs() -> dict:
     """
     """
     data = request.form
+    if missing_fields(data, ('id', *pg_editable)):
+        return ajax_error(MISSING_FORM_FIELDS)
     pg_data = None
 
     try:
-        # TODO: wrap this entire try block in a transaction!!!
-        game = PlayoffGame[typecast(data.get('id'))]
-        upd_info = {x[0]: typecast(data.get(x[0])) for x in pg_layout if x[2] == EDITABLE}
-        team1_pts = upd_info.pop('team1_pts')
-        team2_pts = upd_info.pop('team2_pts')
-        assert len(upd_info) == 0
-        game.add_scores(team1_pts, team2_pts)
-        game.save()
-
-        if game.winner:
-            game.update_team_stats()
-            # REVISIT/FIX: commenting this out for now, since we aren't currently managing
-            # the different brackets properly within team_games!!!
-            #game.insert_team_games()
-
-            # NOTE that we don't automatically finalize the playoff ranks when the bracket
-            # is complete, since the workflow (currently) requires the tabulation to be
-            # manually initiated by the admin.  This same principle applies to seeding,
-            # partner pick, and round robin updates (all above).
-            compute_playoff_ranks(game.bracket)
-            # KINDA HOKEY: we are hard-coding the names of the buttons here (because this
-            # feature is too cool not to wire up right now)--LATER, we should really make
-            # button identification more symbolic!  See associated comments in admin.html.
-            enable_button = None
-            if PlayoffGame.bracket_complete(game.bracket):
-                if game.bracket == Bracket.SEMIS:
-                    TournInfo.mark_stage_complete(TournStage.SEMIS_RESULTS)
-                    enable_button = 'tabulate_semis_results'
-                else:
-                    assert game.bracket == Bracket.FINALS
-                    TournInfo.mark_stage_complete(TournStage.FINALS_RESULTS)
-                    enable_button = 'tabulate_finals_results'
-            pg_props = {prop: getattr(game, prop) for prop in pg_addl_props}
-            if enable_button:
-                pg_props['enableButton'] = enable_button
-            pg_data = game.__data__ | pg_props
-    except AttributeError as e:
-        if str(e) == MISSING_FORM_FIELDS[0]:
-            return ajax_error(MISSING_FORM_FIELDS[1])
-        raise
+        # all updates for the game are committed (or rolled back) together
+        with db_atomic():
+            game = PlayoffGame[typecast(data.get('id'))]
+            upd_info = {k: typecast(data.get(k)) for k in pg_editable}
+            team1_pts = upd_info.pop('team1_pts')
+            team2_pts = upd_info.pop('team2_pts')
+            assert len(upd_info) == 0
+            game.add_scores(team1_pts, team2_pts)
+            game.save()
+
+            if game.winner:
+                game.update_team_stats()
+                # REVISIT/FIX: commenting this out for now, since we aren't currently managing
+                # the different brackets properly within team_games!!!
+                #game.insert_team_games()
+
+                # NOTE that we don't automatically finalize the playoff ranks when the bracket
+                # is complete, since the workflow (currently) requires the tabulation to be
+                # manually initiated by the admin.  This same principle applies to seeding,
+                # partner pick, and round robin updates (all above).
+                compute_playoff_ranks(game.bracket)
+                # KINDA HOKEY: we are hard-coding the names of the buttons here (because this
+                # feature is too cool not to wire up right now)--LATER, we should really make
+                # button identification more symbolic!  See associated comments in admin.html.
+                enable_button = None
+                if PlayoffGame.bracket_complete(game.bracket):
+                    if game.bracket == Bracket.SEMIS:
+                        TournInfo.mark_stage_complete(TournStage.SEMIS_RESULTS)
+                        enable_button = 'tabulate_semis_results'
+                    else:
+                        assert game.bracket == Bracket.FINALS
+                        TournInfo.mark_stage_complete(TournStage.FINALS_RESULTS)
+                        enable_button = 'tabulate_finals_results'
+                pg_data = pg_row(game, game.__data__)
+                if enable_button:
+                    pg_data['enableButton'] = enable_button
     except TypeError as e:
         return ajax_error("Invalid type specified")
     except RuntimeError as e:
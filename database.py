@@ -73,6 +73,7 @@ db = CSqliteExtDatabase(None, pragmas=pragmas, **db_params)
 
 # expose useful attributes (discourage importing `db` directly)
 db_connection_context = db.connection_context
+db_atomic = db.atomic
 
 def db_filepath(name: str, db_dir: str = None) -> str:
     """Build filename (or pathname) based on specified name.
@@ -216,6 +217,15 @@ class BaseModel(Model):
             self._pk is not None and
             self._pk == other._pk)
 
+    def set_values(self, **values) -> None:
+        """Set the specified field values, only marking fields as dirty if the value is
+        actually changing (so that `save()` is a no-op if nothing changed).  Note that raw
+        values are compared (e.g. FK ids rather than related instances).
+        """
+        for name, value in values.items():
+            if name not in self.__data__ or self.__data__[name] != value:
+                setattr(self, name, value)
+
     def save(self, *args, **kwargs):
         """Support for system columns.
         """
@@ -316,7 +316,7 @@ def compute_player_ranks(finalize: bool = False) -> None:
     seed_win_pcts = [pl.seed_win_pct for pl in played]
     seed_ranks = rankdata(seed_win_pcts, method='min')
     for i, pl in enumerate(played):
-        pl.player_pos = seed_ranks[i]
+        pl.set_values(player_pos=seed_ranks[i])
 
     # high-level ranking based on win percentage, before tie-breaking
     played.sort(key=lambda x: x.seed_win_pct, reverse=True)
@@ -324,17 +324,13 @@ def compute_player_ranks(finalize: bool = False) -> None:
         cohort = list(g)
         if len(cohort) == 1:
             pl = cohort[0]
-            pl.player_rank = pl.player_pos
-            pl.seed_tb_crit = None
-            pl.seed_tb_data = None
+            pl.set_values(player_rank=pl.player_pos, seed_tb_crit=None, seed_tb_data=None)
             pl.save()
             continue
         cohort_pos = cohort[0].player_pos
         ranked = rank_player_cohort(cohort)
         for i, (pl, crit, data) in enumerate(ranked):
-            pl.player_rank = cohort_pos + i
-            pl.seed_tb_crit = crit
-            pl.seed_tb_data = data
+            pl.set_values(player_rank=cohort_pos + i, seed_tb_crit=crit, seed_tb_data=data)
             pl.save()
 
     if finalize:
@@ -794,7 +790,7 @@ def compute_tourn_ranks(teams: list[Team]) -> None:
     tourn_ranks = rankdata(team_rank_data, method='min')
 
     for i, tm in enumerate(tm_list):
-        tm.tourn_pos = tourn_ranks[i]
+        tm.set_values(tourn_pos=tourn_ranks[i])
 
     # tournament ranking based on win percentage, before tie-breaking
     tm_list.sort(key=rank_key, reverse=True)
@@ -802,17 +798,15 @@ def compute_tourn_ranks(teams: list[Team]) -> None:
         cohort = list(g)
         if len(cohort) == 1:
             tm = cohort[0]
-            tm.tourn_rank = tm.tourn_pos
-            tm.tourn_tb_crit = None
-            tm.tourn_tb_data = None
+            tm.set_values(tourn_rank=tm.tourn_pos, tourn_tb_crit=None, tourn_tb_data=None)
             tm.save()
             continue
         cohort_pos = cohort[0].tourn_pos
         ranked, stats, data = rank_tourn_cohort(cohort)
         for i, tm in enumerate(ranked):
-            tm.tourn_rank = cohort_pos + i
-            tm.tourn_tb_crit = stats[tm.team_seed]
-            tm.tourn_tb_data = data[tm.team_seed]
+            tm.set_values(tourn_rank=cohort_pos + i,
+                          tourn_tb_crit=stats[tm.team_seed],
+                          tourn_tb_data=data[tm.team_seed])
             tm.save()
 
 def compute_team_ranks(finalize: bool = False) -> None:
@@ -837,7 +831,7 @@ def compute_team_ranks(finalize: bool = False) -> None:
         div_win_pcts = [rank_key(tm) for tm in teams]
         div_ranks = rankdata(div_win_pcts, method='min')
         for i, tm in enumerate(teams):
-            tm.div_pos = div_ranks[i]
+            tm.set_values(div_pos=div_ranks[i])
 
         # division ranking based on win percentage, before tie-breaking
         teams.sort(key=rank_key, reverse=True)
@@ -845,9 +839,7 @@ def compute_team_ranks(finalize: bool = False) -> None:
             cohort = list(g)
             if len(cohort) == 1:
                 tm = cohort[0]
-                tm.div_rank = tm.div_pos
-                tm.div_tb_crit = None
-                tm.div_tb_data = None
+                tm.set_values(div_rank=tm.div_pos, div_tb_crit=None, div_tb_data=None)
                 tm.save()
                 continue
             cohort_pos = cohort[0].div_pos
@@ -863,9 +855,9 @@ def compute_team_ranks(finalize: bool = False) -> None:
                     log.debug(f"Cyclic win group for div {div} rank, pos {cohort_pos}, "
                               f"seeds {grp_seeds}")
             for i, tm in enumerate(ranked):
-                tm.div_rank = cohort_pos + i
-                tm.div_tb_crit = stats[tm.team_seed]
-                tm.div_tb_data = data[tm.team_seed]
+                tm.set_values(div_rank=cohort_pos + i,
+                              div_tb_crit=stats[tm.team_seed],
+                              div_tb_data=data[tm.team_seed])
                 tm.save()
 
     if finalize:
@@ -1060,7 +1052,7 @@ def compute_playoff_ranks(bracket: Bracket, finalize: bool = False) -> None:
                              -x.tourn_rank)  # <-- reward better round robin play
     final_four.sort(key=playoff_key, reverse=True)
     for i, team in enumerate(final_four):
-        team.playoff_rank = i + 1
+        team.set_values(playoff_rank=i + 1)
         team.save()
 
     # NOTE that the direction of this sort is different than above--we do ascending here,
@@ -1072,7 +1064,7 @@ def compute_playoff_ranks(bracket: Bracket, finalize: bool = False) -> None:
                            x.tourn_rank)      # fairness across divisions
     tm_list.sort(key=final_key, reverse=False)
     for i, team in enumerate(tm_list):
-        team.final_rank = i + 1
+        team.set_values(final_rank=i + 1)
         team.save()
 
     if finalize:
@@ -624,7 +624,9 @@ def pick_partner(form: dict) -> str:
         player.save(cascade=True)
         # REVISIT: we should try and incorporate this into update_tourn_stage (would have to
         # rethink the interface for that, though)!!!
-        if PartnerPick.current_round() == -1:
+        # `avail` (players left after this pick) being empty is equivalent to
+        # `PartnerPick.current_round() == -1`, without requerying the pick count
+        if not avail:
             TournInfo.mark_stage_complete(TournStage.PARTNER_PICK)
     except RuntimeError as e:
         flash(f"err={str(e)}")
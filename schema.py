@@ -2,11 +2,12 @@
 
 from enum import IntEnum, StrEnum
 from typing import ClassVar, Self, Iterator, NamedTuple
+import time
 import re
 
 from ckautils import typecast
 from peewee import (TextField, IntegerField, BooleanField, FloatField, ForeignKeyField,
-                    DeferredForeignKey, OperationalError, DoesNotExist, fn)
+                    DeferredForeignKey, OperationalError, DoesNotExist, JOIN, fn)
 from playhouse.sqlite_ext import JSONField
 from werkzeug.security import generate_password_hash, check_password_hash
 
@@ -163,6 +164,7 @@ class TournInfo(BaseModel):
 
     # class variables
     inst: ClassVar[Self] = None  # singleton instance
+    inst_time: ClassVar[float] = 0.0  # monotonic time of last query for `inst`
 
     @classmethod
     def clear_cache(cls) -> None:
@@ -173,16 +175,20 @@ class TournInfo(BaseModel):
         cls.inst = None
 
     @classmethod
-    def get(cls, requery: bool = False) -> Self:
+    def get(cls, requery: bool = False, max_age: float = None) -> Self:
         """Return cached singleton instance (purposefully shadows more general base class
-        method).
+        method).  If `max_age` (in seconds) is specified, `requery` only applies if the
+        cached instance was queried longer ago than that.
         """
         if cls != TournInfo:
             raise ImplementationError(f"cannot cache TournInfo subclass instance")
+        if requery and max_age is not None:
+            requery = time.monotonic() - cls.inst_time > max_age
         if cls.inst is None or requery:
             res = [t for t in cls.select().limit(2)]
             assert len(res) == 1  # fails if not initialized, or unexpected multiple records
             cls.inst = res[0]
+            cls.inst_time = time.monotonic()
         return cls.inst
 
     @classmethod
@@ -403,14 +409,30 @@ class Player(BaseModel, EuchmgrUser):
         return list(filter(lambda x: x.available, pl_iter))
 
     @classmethod
-    def iter_players(cls, by_rank: bool = False, no_nums: bool = False) -> Iterator[Self]:
-        """Iterator for players (wrap ORM details).
+    def iter_players(cls, by_rank: bool = False, no_nums: bool = False,
+                     order_by: str = None, join_picks: bool = False) -> Iterator[Self]:
+        """Iterator for players (wrap ORM details).  `order_by` (field name) is ignored if
+        `by_rank` is specified.  If `join_picks` is specified, the partner and picked-by
+        player records are fetched in the same query.
         """
-        query = cls.select()
+        if join_picks:
+            # allow for overridden FKs (e.g. in ui_schema)
+            Partner  = cls.partner.rel_model.alias()
+            Partner2 = cls.partner2.rel_model.alias()
+            PickedBy = cls.picked_by.rel_model.alias()
+            query = (cls
+                     .select(cls, Partner, Partner2, PickedBy)
+                     .join_from(cls, Partner, JOIN.LEFT_OUTER, on=cls.partner)
+                     .join_from(cls, Partner2, JOIN.LEFT_OUTER, on=cls.partner2)
+                     .join_from(cls, PickedBy, JOIN.LEFT_OUTER, on=cls.picked_by))
+        else:
+            query = cls.select()
         if no_nums:
             query = query.where(cls.player_num.is_null(True))
         if by_rank:
             query = query.order_by(cls.player_rank.asc(nulls='last'))
+        elif order_by:
+            query = query.order_by(getattr(cls, order_by))
         for p in query:
             yield p
 
@@ -429,9 +451,10 @@ class Player(BaseModel, EuchmgrUser):
     @property
     def available(self) -> str | None:
         """For partner picking UI; returns 'y' or None.  Note that this return value
-        evaluates correctly as a boolean.
+        evaluates correctly as a boolean.  The raw FK values are checked, so that the
+        related records are not fetched.
         """
-        return 'y' if not (self.partner or self.picked_by) else None
+        return 'y' if not (self.partner_num or self.picked_by_num) else None
 
     def get_game_stats(self, opps: list[Self] = None) -> dict:
         """Get stats for player's games (all, or versus specified opponents)
@@ -749,8 +772,10 @@ class Team(BaseModel):
         )
 
     @classmethod
-    def iter_teams(cls, div: int = None, by_rank: bool = False) -> Iterator[Self]:
-        """Iterator for teams (wrap ORM details).
+    def iter_teams(cls, div: int = None, by_rank: bool = False,
+                   order_by: str | tuple[str, ...] = None) -> Iterator[Self]:
+        """Iterator for teams (wrap ORM details).  `order_by` (field name, or tuple of field
+        names) is ignored if `by_rank` is specified.
         """
         query = cls.select()
         if div:
@@ -759,6 +784,9 @@ class Team(BaseModel):
                 query = query.order_by(cls.div_rank.asc(nulls='last'))
         elif by_rank:
             query = query.order_by(cls.tourn_rank.asc(nulls='last'))
+        if order_by and not by_rank:
+            fields = (order_by,) if isinstance(order_by, str) else order_by
+            query = query.order_by(*(getattr(cls, field) for field in fields))
         for t in query:
             yield t
 
@@ -1042,10 +1070,21 @@ class PlayoffGame(BaseModel):
         )
 
     @classmethod
-    def iter_games(cls, bracket: Bracket = None, by_matchup: bool = False) -> Iterator[Self]:
-        """Iterator for playoff_games (wrap ORM details).
+    def iter_games(cls, bracket: Bracket = None, by_matchup: bool = False,
+                   join_teams: bool = False) -> Iterator[Self]:
+        """Iterator for playoff_games (wrap ORM details).  If `join_teams` is specified,
+        the associated team records are fetched in the same query.
         """
-        query = cls.select()
+        if join_teams:
+            # allow for overridden FKs (e.g. in ui_schema)
+            Team1 = cls.team1.rel_model.alias()
+            Team2 = cls.team2.rel_model.alias()
+            query = (cls
+                     .select(cls, Team1, Team2)
+                     .join_from(cls, Team1, on=cls.team1)
+                     .join_from(cls, Team2, on=cls.team2))
+        else:
+            query = cls.select()
         if bracket:
             query = query.where(cls.bracket == bracket)
         if by_matchup:
@@ -1170,15 +1209,33 @@ class PlayerGame(BaseModel):
         )
 
     @classmethod
-    def iter_games(cls, include_byes: bool = False) -> Iterator[Self]:
-        """Iterator for seed_games (wrap ORM details).
+    def iter_games(cls, include_byes: bool = False,
+                   join_player: bool = False) -> Iterator[Self]:
+        """Iterator for seed_games (wrap ORM details).  If `join_player` is specified,
+        the associated player records are fetched in the same query.
         """
-        query = cls.select()
+        if join_player:
+            PlayerRef = cls.player.rel_model  # allow for overridden FK (e.g. in ui_schema)
+            query = cls.select(cls, PlayerRef).join(PlayerRef, on=cls.player)
+        else:
+            query = cls.select()
         if not include_byes:
             query = query.where(cls.is_bye == False)
         for t in query:
             yield t
 
+    @classmethod
+    def iter_game_rows(cls, include_byes: bool = False) -> Iterator[tuple]:
+        """Iterator for seed_games, yielding lightweight rows (named tuples) with only the
+        fields needed for tabulating scores, rather than model instances.
+        """
+        query = cls.select(cls.player.alias('player_num'), cls.round_num, cls.is_bye,
+                           cls.team_pts, cls.opp_pts, cls.is_winner)
+        if not include_byes:
+            query = query.where(cls.is_bye == False)
+        for t in query.namedtuples():
+            yield t
+
     def save(self, *args, **kwargs):
         """Set player name (denorm field) as player's nick name
         """
@@ -1214,15 +1271,33 @@ class TeamGame(BaseModel):
         )
 
     @classmethod
-    def iter_games(cls, include_byes: bool = False) -> Iterator[Self]:
-        """Iterator for tourn_games (wrap ORM details).
+    def iter_games(cls, include_byes: bool = False,
+                   join_team: bool = False) -> Iterator[Self]:
+        """Iterator for tourn_games (wrap ORM details).  If `join_team` is specified,
+        the associated team records are fetched in the same query.
         """
-        query = cls.select()
+        if join_team:
+            TeamRef = cls.team.rel_model  # allow for overridden FK (e.g. in ui_schema)
+            query = cls.select(cls, TeamRef).join(TeamRef, on=cls.team)
+        else:
+            query = cls.select()
         if not include_byes:
             query = query.where(cls.is_bye == False)
         for t in query:
             yield t
 
+    @classmethod
+    def iter_game_rows(cls, include_byes: bool = False) -> Iterator[tuple]:
+        """Iterator for tourn_games, yielding lightweight rows (named tuples) with only the
+        fields needed for tabulating scores, rather than model instances.
+        """
+        query = cls.select(cls.team.alias('team_id'), cls.round_num, cls.is_bye,
+                           cls.team_pts, cls.opp_pts, cls.is_winner)
+        if not include_byes:
+            query = query.where(cls.is_bye == False)
+        for t in query.namedtuples():
+            yield t
+
     def save(self, *args, **kwargs):
         """Set team and opponane names (denorm fields)
         """
@@ -5,6 +5,7 @@
 implements the Flask "application factory" pattern through the ``create_app()`` call.
 """
 
+import os
 import re
 import traceback
 
@@ -13,6 +14,7 @@ from flask import Flask, current_app, g, request, session, url_for, flash
 from flask.globals import request_ctx
 from flask_session import Session
 from cachelib.file import FileSystemCache
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.exceptions import HTTPException
 
@@ -59,6 +61,7 @@ class Config:
     """
     SESSION_TYPE = 'cachelib'
     SESSION_CACHELIB = FileSystemCache(cache_dir="sessions", default_timeout=0)
+    JINJA_CACHE_DIR = "jinja_cache"  # compiled template bytecode (`None` to disable)
 
 # instantiate extensions globally
 sess_ext = Session()
@@ -74,6 +77,16 @@ def create_app(config: object | Config = Config, proxied: bool = False) -> Flask
         app.wsgi_app = ProxyFix(app.wsgi_app)
 
     app.config.from_object(config)
+    # no need to sort keys when serializing ajax data (DataTables columns are named)
+    app.json.sort_keys = False
+    # drop the whitespace around block tags in rendered output (must be set before the
+    # jinja environment is first accessed)
+    app.jinja_options = {**app.jinja_options, 'trim_blocks': True, 'lstrip_blocks': True}
+    # note that the bytecode cache must be set up before registering blueprints (which may
+    # precompile templates)
+    if cache_dir := app.config.get('JINJA_CACHE_DIR'):
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
     app.register_blueprint(admin)
     app.register_blueprint(data)
     app.register_blueprint(mobile, url_prefix=MOBILE_URL_PFX)
@@ -20,6 +20,7 @@ from conftest import TestConfig, AdminAppProxy, TEST_DB, ROSTER_FILE
 from database import db_reset
 from schema import TournStage, TournInfo, clear_schema_cache
 from admin import View, VIEW_DEFS, SEL_NEW
+from data import MISSING_FORM_FIELDS
 from server import create_app
 
 #################
@@ -201,6 +202,59 @@ def test_get_players_data(admin_client):
     assert isinstance(ajax_resp['data'], list)
     assert len(ajax_resp['data']) == tourn.players
 
+def test_post_players_missing_field(admin_client):
+    """POST of player data with a missing form field should return an error, and not
+    update the player record.
+    """
+    client = admin_client
+    resp = client.get("/players/data")
+    assert resp.status_code == 200
+    player = json.loads(resp.text)['data'][0]
+
+    data = {
+        'id'       : player['id'],
+        'nick_name': f"{player['nick_name']}-upd"
+        # 'player_num' is missing
+    }
+    resp = client.post("/players/data", data=data, follow_redirects=True)
+    assert resp.status_code == 200
+    assert len(resp.history) == 0
+
+    ajax_resp = json.loads(resp.text)
+    assert not ajax_resp['succ']
+    assert ajax_resp['err'] == MISSING_FORM_FIELDS
+
+    resp = client.get("/players/data")
+    assert resp.status_code == 200
+    pl_data = {pl['id']: pl for pl in json.loads(resp.text)['data']}
+    assert pl_data[player['id']] == player
+
+def test_get_players_data_not_modified(admin_client):
+    """Repeating a GET of player data with the returned ETag should return "304 Not
+    Modified" (no payload), until something is posted.
+    """
+    client = admin_client
+    resp = client.get("/players/data")
+    assert resp.status_code == 200
+    assert resp.headers.get('ETag')
+    etag = resp.headers['ETag']
+    player = json.loads(resp.text)['data'][0]
+
+    resp = client.get("/players/data", headers={'If-None-Match': etag})
+    assert resp.status_code == 304
+    assert resp.headers['ETag'] == etag
+    assert not resp.data
+
+    # any POST bumps the data version (even if nothing is actually updated)
+    resp = client.post("/players/data", data={'id': player['id']})
+    assert resp.status_code == 200
+
+    resp = client.get("/players/data", headers={'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert resp.headers['ETag'] != etag
+    ajax_resp = json.loads(resp.text)
+    assert ajax_resp['succ']
+
 def test_gen_player_nums(admin_client):
     """Generating player nums should enable the `gen_seed_bracket` button.
     """
@@ -258,6 +312,22 @@ def test_get_seeding_data(admin_client):
     assert isinstance(ajax_resp['data'], list)
     assert len(ajax_resp['data']) == ngames + bye_recs
 
+def test_sd_dash_not_modified(admin_client):
+    """Repeating a GET of the seeding round live dashboard with the returned ETag should
+    return "304 Not Modified" (no payload).
+    """
+    client = admin_client
+    resp = client.get("/dash/sd_dash")
+    assert resp.status_code == 200
+    assert resp.headers.get('ETag')
+    assert resp.cache_control.must_revalidate
+    etag = resp.headers['ETag']
+
+    resp = client.get("/dash/sd_dash", headers={'If-None-Match': etag})
+    assert resp.status_code == 304
+    assert resp.headers['ETag'] == etag
+    assert not resp.data
+
 def test_fake_seed_results(admin_client):
     """Generating fake seed results should enable the `tabulate_seed_results` button.
     """
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""Test `database` module support (change tracking for saves, transactions).
+"""
+
+import pytest
+from peewee import IntegrityError
+
+from database import db_atomic
+from schema import Player
+
+def fetch_player(player_num: int) -> Player:
+    """Fetch player record directly from the database (bypassing any cached instances).
+    """
+    return Player.get(Player.player_num == player_num)
+
+def test_set_values_unchanged(stage_3_db) -> None:
+    """Saving after setting unchanged values should be a no-op (including not bumping
+    `updated_at`).
+    """
+    player = fetch_player(1)
+    updated_at = player.updated_at
+    player.set_values(nick_name=player.nick_name,
+                      player_num=player.player_num,
+                      seed_wins=player.seed_wins,
+                      player_rank=player.player_rank)
+    assert not player.is_dirty()
+    assert player.save() is False
+    assert player.updated_at == updated_at
+    assert fetch_player(1).updated_at == updated_at
+
+def test_set_values_changed(stage_3_db) -> None:
+    """Only changed values should be marked as dirty, and they should be persisted upon
+    saving.
+    """
+    player = fetch_player(1)
+    seed_wins = player.seed_wins + 1
+    player.set_values(nick_name=player.nick_name, seed_wins=seed_wins)
+    assert [f.name for f in player.dirty_fields] == ['seed_wins']
+    assert player.save()
+
+    player = fetch_player(1)
+    assert player.seed_wins == seed_wins
+    assert player.updated_at
+
+def test_db_atomic_rollback(stage_3_db) -> None:
+    """Updates made within a `db_atomic` block should all be rolled back if a subsequent
+    update fails.
+    """
+    player1 = fetch_player(1)
+    player2 = fetch_player(2)
+    seed_wins = player1.seed_wins
+    nick_name = player2.nick_name
+    with pytest.raises(IntegrityError):
+        with db_atomic():
+            player1.set_values(seed_wins=seed_wins + 1)
+            player1.save()
+            # violates unique constraint on nick_name
+            player2.set_values(nick_name=player1.nick_name)
+            player2.save()
+
+    assert fetch_player(1).seed_wins == seed_wins
+    assert fetch_player(2).nick_name == nick_name
@@ -10,8 +10,8 @@ from dataclasses import asdict
 import re
 
 from ckautils import typecast
-from flask import (g, request, render_template, redirect as flask_redirect, abort,
-                   get_flashed_messages)
+from flask import (Response, g, request, render_template, redirect as flask_redirect,
+                   abort, get_flashed_messages)
 
 from core import log, ImplementationError
 from security import SecurityMixin
@@ -30,6 +30,8 @@ def mobile_client() -> bool:
 
 Scalar = str | int | float | bool | None
 
+FLASH_PARAM_RE = re.compile(r'(\w+)=(.+)')
+
 def process_flashes() -> tuple[dict[str, Scalar], list[Scalar]]:
     """Process flashed messages, returning a dict of parameterized flashes (i.e. messages
     of the form "key=val"), as well as a list of unparameterized flashes (which are now
@@ -39,10 +41,14 @@ def process_flashes() -> tuple[dict[str, Scalar], list[Scalar]]:
 
     Note that this call clears out the flashed message buffer for the user session.
     """
+    flashes = get_flashed_messages()
+    if not flashes:
+        return {}, []
+
     params = {}
     msgs = []
-    for msg in get_flashed_messages():
-        if m := re.fullmatch(r'(\w+)=(.+)', msg):
+    for msg in flashes:
+        if m := FLASH_PARAM_RE.fullmatch(msg):
             key, val = m.group(1, 2)
             if key in ('err', 'info'):
                 if key not in params:
@@ -60,6 +66,8 @@ def process_flashes() -> tuple[dict[str, Scalar], list[Scalar]]:
 def msg_join(msgs: list[str]) -> str:
     """Context-senstive message joiner for `err` and `info` flahsed messages.
     """
+    if not msgs:
+        return ''
     msg_sep = "\n" if g.api_call else "<br>"
     return msg_sep.join(msgs)
 
@@ -176,6 +184,20 @@ def render_error(code: int, name: str = None, desc: str = None) -> str:
     }
     return render_template(ERROR_TEMPLATE, **context), code
 
+def conditional_response(resp: Response, etag: str = None) -> Response:
+    """Tag the response with the specified entity tag (or one hashed from the content, if
+    not specified), have private caches always revalidate it, and return "304 Not Modified"
+    if the request's `If-None-Match` matches.
+    """
+    if etag:
+        resp.set_etag(etag)
+    else:
+        resp.add_etag()
+    resp.cache_control.private = True
+    resp.cache_control.max_age = 0
+    resp.cache_control.must_revalidate = True
+    return resp.make_conditional(request)
+
 # TEMP: create "api" return calls using ajax returns as a model--LATER, we need to unify
 # these two layers!!!
 
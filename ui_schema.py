@@ -5,9 +5,11 @@ as formatting and display-related utilities.
 """
 
 from typing import Self, Iterator
+from functools import lru_cache
 
 from peewee import ForeignKeyField, DeferredForeignKey, fn
 from flask import g
+from markupsafe import Markup
 
 from database import BaseModel
 from schema import (rnd_pct, Bracket, BRACKET_NAME, TournStage, TournInfo, Player as BasePlayer,
@@ -30,38 +32,54 @@ PTS_PCT_NA = -1.0
 PCT_PREC = 3
 PCT_FMT = '.03f'
 
-def fmt_pct(val: float) -> str:
+# special values for `fmt_pct`--yes, the general formatting may produce the same string
+# for some of these, but we want to allow ourselves the freedom to make them different
+PCT_SPECIAL = {
+    None      : Markup(''),
+    PTS_PCT_NA: Markup('&ndash;'),  # or "n/a"?
+    1.0       : Markup('1.000')
+}
+
+@lru_cache(maxsize=1024)
+def fmt_pct(val: float) -> Markup:
     """Provide consistent formatting for percentage values (appropriate rounding and
-    look), used for grids, charts, dashboards, and reports.
+    look), used for grids, charts, dashboards, and reports.  Returned as `Markup`, since
+    the output may contain HTML entities.
     """
-    if val is None:
-        return ''
-    elif val == PTS_PCT_NA:
-        return '&ndash;'  # or "n/a"?
-    # take care of (possible!) exceptions first--yes, the code below may produce the same
-    # string, but we want to allow ourselves the freedom to make this something different
-    if val == 1.0:
-        return '1.000'
-
-    # make everything else look like .xxx (with trailing zeros)
-    as_str = f"{round(val, PCT_PREC):{PCT_FMT}}"
-    if as_str.startswith('0.'):
-        return as_str[1:]
+    special = PCT_SPECIAL.get(val)
+    if special is not None:
+        return special
+
+    # make everything else look like .xxx (with trailing zeros); note that the format
+    # spec does the rounding, so no need to call `round()` first
+    as_str = f"{val:{PCT_FMT}}"
     # not expecting negative input or anything >1.0
-    assert False, f"unexpected percentage value of '{val}'"
+    assert as_str.startswith('0.'), f"unexpected percentage value of '{val}'"
+    return Markup(as_str[1:])
 
 TALLY_FILE_PFX = "/static/tally_"
 TALLY_FILE_SFX = ".png"
 TALLY_HEIGHT = 15
 TALLY_WIDTH = 50
+TALLY_MAX = 10  # highest numbered tally image
 
-def fmt_tally(pts: int) -> str:
-    """Print arguments for <img> tag for showing point tallies
+def tally_attrs(pts: int) -> Markup:
+    """Build arguments for <img> tag for showing point tallies (see `fmt_tally`)
     """
     if pts == 0:
-        return ''
+        return Markup('')
     tally_file = f"{TALLY_FILE_PFX}{pts}{TALLY_FILE_SFX}"
-    return f'src="{tally_file}" height="{TALLY_HEIGHT}" width="{TALLY_WIDTH}"'
+    return Markup(f'src="{tally_file}" height="{TALLY_HEIGHT}" width="{TALLY_WIDTH}"')
+
+# precomputed <img> arguments, indexed by tally
+TALLY_ATTRS = tuple(tally_attrs(pts) for pts in range(TALLY_MAX + 1))
+
+def fmt_tally(pts: int) -> Markup:
+    """Print arguments for <img> tag for showing point tallies
+    """
+    if 0 <= pts <= TALLY_MAX:
+        return TALLY_ATTRS[pts]
+    return tally_attrs(pts)
 
 ###########
 # UIMixin #
@@ -130,9 +148,13 @@ class Player(UIMixin, BasePlayer):
 
     @classmethod
     def find_by_name_pfx(cls, name_pfx: str) -> Iterator[Self]:
-        """Iterator returning players matching the specified (nick) name prefix.
+        """Iterator returning players matching the specified (nick) name prefix, ordered
+        by name.
         """
-        query = cls.select().where(cls.nick_name.startswith(name_pfx))
+        query = (cls
+                 .select()
+                 .where(cls.nick_name.startswith(name_pfx))
+                 .order_by(cls.nick_name))
         for p in query:
             yield p
 
@@ -313,16 +335,15 @@ class Player(UIMixin, BasePlayer):
         elif isinstance(picks_info, str):
             match = list(Player.find_by_name_pfx(picks_info))
             match_av = list(filter(lambda x: x.available, match))
+            # note that matches are already ordered by name
             if len(match_av) > 1:
-                av_by_name = sorted(match_av, key=lambda pl: pl.name)
-                samples = ', '.join([p.name for p in av_by_name][:2]) + ", etc."
+                samples = ', '.join(p.name for p in match_av[:2]) + ", etc."
                 raise RuntimeError(f"Multiple matches for name starting with \"{picks_info}\" "
                                    f"available ({samples}); please respecify")
             elif len(match_av) == 1:
                 partner = match_av.pop()
             elif len(match) > 1:
-                by_name = sorted(match, key=lambda pl: pl.name)
-                samples = ', '.join([p.name for p in by_name][:2]) + ", etc."
+                samples = ', '.join(p.name for p in match[:2]) + ", etc."
                 raise RuntimeError(f"All matches for name starting with \"{picks_info}\" "
                                    f"already on a team ({samples})")
             elif len(match) == 1: